@@ -2,10 +2,10 @@
 effects モジュール - 音響エフェクト機能
 """
 
-from .filters import LowPassFilter, HighPassFilter, BandPassFilter, SimpleMovingAverageFilter
-from .audio_effects import Reverb, Distortion, Delay, Chorus, Compressor
+from .filters import LowPassFilter, HighPassFilter, BandPassFilter, SimpleMovingAverageFilter, FilterChain
+from .audio_effects import Reverb, ConvolutionReverb, Distortion, Delay, Chorus, Compressor
 
 __all__ = [
-    'LowPassFilter', 'HighPassFilter', 'BandPassFilter', 'SimpleMovingAverageFilter',
-    'Reverb', 'Distortion', 'Delay', 'Chorus', 'Compressor'
+    'LowPassFilter', 'HighPassFilter', 'BandPassFilter', 'SimpleMovingAverageFilter', 'FilterChain',
+    'Reverb', 'ConvolutionReverb', 'Distortion', 'Delay', 'Chorus', 'Compressor'
 ]
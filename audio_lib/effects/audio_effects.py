@@ -4,12 +4,20 @@
 リバーブ、ディストーション、ディレイなどの効果処理
 """
 
+import hashlib
+from collections import OrderedDict
+from math import gcd
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin, kaiser_beta, lfilter, resample_poly
 from ..core.audio_config import AudioConfig
+from ..core.wave_io import WaveFileIO
 
 # エクスポート対象を明示
 __all__ = [
     'Reverb',
+    'ConvolutionReverb',
     'Distortion', 
     'Delay',
     'Chorus',
@@ -17,10 +25,72 @@ __all__ = [
     'apply_compression'
 ]
 
+# オーバーサンプリング倍率 -> ローパスFIR係数
+_OVERSAMPLING_FILTERS = {}
+
+# オーバーサンプリングフィルターの位相ごとのタップ数と阻止域減衰量 (dB)
+_OVERSAMPLING_TAPS_PER_PHASE = 64
+_OVERSAMPLING_ATTENUATION = 90.0
+
+def _get_oversampling_filter(factor):
+    """
+    オーバーサンプリング用のローパスFIRフィルターを取得（倍率ごとに1回だけ設計）
+    
+    遮断周波数は元のナイキスト周波数（0.5 / factor サイクル/サンプル）で、
+    元のナイキスト周波数の0.9倍までを平坦に通し、1.1倍から先を約90dB減衰させます。
+    44.1kHzでは20kHzまで減衰せず、折り返しが起きても20kHzより上に収まります。
+    
+    Args:
+        factor (int): オーバーサンプリング倍率
+        
+    Returns:
+        np.ndarray: FIR係数（長さは倍率の倍数、読み取り専用）
+    """
+    if factor not in _OVERSAMPLING_FILTERS:
+        fir = firwin(
+            _OVERSAMPLING_TAPS_PER_PHASE * factor, 1.0 / factor,
+            window=('kaiser', kaiser_beta(_OVERSAMPLING_ATTENUATION))
+        )
+        fir.flags.writeable = False
+        _OVERSAMPLING_FILTERS[factor] = fir
+    return _OVERSAMPLING_FILTERS[factor]
+
+def _process_feedback_delay_line(delay_line, delay_index, input_signal, feedback):
+    """
+    フィードバック付き遅延ラインをブロック単位で処理
+    
+    遅延長Dの遅延ラインに書き込まれる値は w[n] = x[n] + feedback * w[n-D] です。
+    D個先までの値は直前のD個だけで決まるので、Dサンプルずつ配列演算で計算できます。
+    
+    Args:
+        delay_line (np.ndarray): 遅延ライン（リングバッファ）
+        delay_index (int): 次に読み書きする位置
+        input_signal (np.ndarray): 入力信号
+        feedback (float): フィードバック量
+        
+    Returns:
+        tuple: (遅延した信号, 新しい遅延ライン（古い順に並び、次の位置は0）)
+    """
+    delay_length = len(delay_line)
+    num_samples = len(input_signal)
+    
+    # 遅延ラインの内容（古い順）に続けて、これから書き込む値を並べる
+    written = np.empty(delay_length + num_samples)
+    written[:delay_length] = np.roll(delay_line, -delay_index)
+    
+    for start in range(0, num_samples, delay_length):
+        end = min(start + delay_length, num_samples)
+        written[delay_length + start:delay_length + end] = (
+            input_signal[start:end] + feedback * written[start:end]
+        )
+    
+    return written[:num_samples], written[num_samples:].copy()
+
 class Reverb:
     """リバーブ（残響）エフェクト"""
     
-    def __init__(self, room_size=0.5, damping=0.5, wet_level=0.3, reverb_time=None, config=None):
+    def __init__(self, room_size=0.5, damping=0.5, wet_level=0.3, reverb_time=None, config=None,
+                 limiter_lookahead=0.0, limiter_release=0.1):
         """
         リバーブエフェクトを初期化
         
@@ -30,6 +100,10 @@ class Reverb:
             wet_level (float): エフェクト音のレベル (0.0-1.0)
             reverb_time (float): 残響時間 (秒) - 後方互換性のため
             config (AudioConfig): オーディオ設定
+            limiter_lookahead (float): クリッピング防止リミッターの先読み時間 (秒)。
+                0（既定）では遅延なしで、新しいピークのサンプルには瞬時にゲインがかかる。
+                正の値ではピークの手前からなめらかにゲインを下げる代わりに、出力がlatencyサンプル遅れる
+            limiter_release (float): リミッターのゲインが20dB回復するのにかかる時間 (秒)
         """
         self.config = config or AudioConfig()
         self.room_size = room_size
@@ -58,17 +132,130 @@ class Reverb:
             self.feedbacks.append(feedback)
         
         self.delay_indices = [0] * len(self.delays)
+        
+        # クリッピング防止リミッターの設定
+        # 先読みの分だけ出力が遅れる（latencyサンプル、先読みなしなら0）
+        self.limiter_lookahead = limiter_lookahead
+        self.limiter_release = limiter_release
+        self._lookahead_samples = max(int(limiter_lookahead * self.config.sample_rate), 1)
+        self.latency = self._lookahead_samples - 1
+        self._release_rate = 20.0 / max(limiter_release * self.config.sample_rate, 1.0)  # dB/サンプル
+        
+        self.reset()
     
-    def process(self, input_signal):
+    def reset(self):
+        """遅延ラインとリミッターの状態をリセット"""
+        for delay_line in self.delays:
+            delay_line[:] = 0.0
+        self.delay_indices = [0] * len(self.delays)
+        
+        # リミッターの状態（直前のゲイン、必要ゲインの履歴、遅延中の信号）
+        self.limiter_gain_db = 0.0
+        self._required_gain_history = np.zeros(2 * self.latency)
+        self._limiter_delay = np.zeros(self.latency)
+    
+    def process(self, input_signal, mode='vectorized'):
         """
         リバーブエフェクトを適用
         
+        'vectorized'では、クリッピング防止に信号全体のピーク正規化ではなく
+        ストリーミング対応のリミッター（なめらかに回復するゲインエンベロープ）を使うため、
+        ブロックごとに分割して処理できます。
+        
+        limiter_lookaheadを指定した場合、出力は入力よりlatencyサンプル遅れます。
+        最後のブロックの後で flush() を呼ぶと、リミッター内に残ったサンプルを取り出せます。
+        
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号（モノラル）
+            mode (str): 処理方式
+                'vectorized' - 各遅延ラインを遅延長ごとのブロックで一括計算（既定）
+                'reference'  - 1サンプルずつ計算し、最後に全体を正規化する参照実装
             
         Returns:
             np.ndarray: リバーブが適用された信号
         """
+        if mode == 'vectorized':
+            return self._process_vectorized(input_signal)
+        elif mode == 'reference':
+            return self._process_reference(input_signal)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+    
+    def _process_vectorized(self, input_signal):
+        """コムフィルターバンクの一括処理"""
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros_like(x)
+        
+        # 各遅延ラインを処理し、遅延した信号を合計
+        reverb_sum = np.zeros_like(x)
+        for i, feedback in enumerate(self.feedbacks):
+            delayed, self.delays[i] = _process_feedback_delay_line(
+                self.delays[i], self.delay_indices[i], x, feedback * self.damping
+            )
+            self.delay_indices[i] = 0
+            reverb_sum += delayed
+        
+        # ドライ音とウェット音をミックス
+        wet_signal = reverb_sum / len(self.delays)
+        output = self.dry_level * x + self.wet_level * wet_signal
+        
+        return self._apply_limiter(output)
+    
+    def _apply_limiter(self, output):
+        """
+        クリッピング防止のリミッター
+        
+        各サンプルを1.0以下に収めるのに必要なゲイン(dB)を求め、先読み区間の最小値を
+        移動平均でなめらかにしたものをアタック、一定の速さの回復をリリースとして
+        ゲインエンベロープを作ります。移動最小値と移動平均の組み合わせにより、
+        遅延させた信号には必ず必要以下のゲインがかかるため、ピークがつぶれずに1.0以下に収まります。
+        先読みなし（区間の長さ1）では、必要なゲインをそのまま使う瞬時アタックになります。
+        状態をブロック間で引き継ぐため、分割処理しても結果は変わりません。
+        """
+        length = self._lookahead_samples
+        num_samples = len(output)
+        
+        required = -20.0 * np.log10(np.maximum(np.abs(output), 1.0))
+        
+        # 先読み区間の最小値 -> 移動平均（アタック）
+        gains = np.concatenate((self._required_gain_history, required))
+        if self.latency > 0:
+            self._required_gain_history = gains[-2 * self.latency:]
+        window_min = sliding_window_view(gains, length).min(axis=1)
+        smoothed = np.convolve(window_min, np.full(length, 1.0 / length), mode='valid')
+        
+        # 回復を1サンプルあたりrelease_rate dBに制限（リリース）
+        # g[n] = min(smoothed[n], g[n-1] + rate) を累積最小値で一括計算する
+        ramp = self._release_rate * np.arange(num_samples)
+        limit = np.minimum.accumulate(smoothed - ramp)
+        gain_db = ramp + np.minimum(limit, self.limiter_gain_db + self._release_rate)
+        self.limiter_gain_db = gain_db[-1]
+        
+        # ゲインの計算に合わせて信号をlatencyサンプル遅らせる
+        delayed = np.concatenate((self._limiter_delay, output))
+        self._limiter_delay = delayed[num_samples:]
+        
+        limited = delayed[:num_samples] * 10.0 ** (gain_db / 20.0)
+        # dBと線形の変換による丸め誤差の分だけ1.0を超えないようにする
+        return np.clip(limited, -1.0, 1.0)
+    
+    def flush(self):
+        """
+        リミッターの先読みで遅れているlatencyサンプルを取り出す
+        
+        この後に無音が続くものとしてゲインを計算し、リミッターの遅延を空にします。
+        遅延線（残響）の状態は変わりません。
+        
+        Returns:
+            np.ndarray: 残っていたlatencyサンプルの出力
+        """
+        if self.latency == 0:
+            return np.zeros(0)
+        return self._apply_limiter(np.zeros(self.latency))
+    
+    def _process_reference(self, input_signal):
+        """1サンプルずつ計算する参照実装"""
         output = np.zeros_like(input_signal)
         
         for n, x_n in enumerate(input_signal):
@@ -104,6 +291,9 @@ class Reverb:
         """
         リバーブエフェクトを適用（教育用便利メソッド）
         
+        リミッターに先読みがある場合は flush() で残りを取り出してレイテンシを補正し、
+        入力と時間がそろった信号を返します。
+        
         Args:
             input_signal (np.ndarray): 入力信号
             sample_rate (int): サンプリングレート（未使用、互換性のため）
@@ -111,12 +301,241 @@ class Reverb:
         Returns:
             np.ndarray: リバーブが適用された信号
         """
-        return self.process(input_signal)
+        output = self.process(input_signal)
+        if self.latency == 0:
+            return output
+        return np.concatenate((output, self.flush()))[self.latency:]
+
+class ConvolutionReverb:
+    """
+    畳み込みリバーブ（一様分割オーバーラップセーブ法）
+    
+    インパルス応答をblock_sizeごとに分割し、各分割のスペクトルと
+    過去の入力ブロックのスペクトルを周波数領域で掛け合わせます。
+    FFTのサイズはインパルス応答の長さによらず2 * block_sizeで一定で、
+    遅延（レイテンシ）は1ブロック分です。
+    
+    インパルス応答のスペクトルはクラス全体で共有するキャッシュに保存されるため、
+    同じ部屋のインパルス応答を複数のトラックで使ってもFFTは1回で済みます。
+    キャッシュには最近使った_spectrum_cache_size個までを保持します。
+    """
+    
+    # (インパルス応答のハッシュ, block_size) -> 分割スペクトル（LRU順）
+    _spectrum_cache = OrderedDict()
+    _spectrum_cache_size = 8
+    
+    def __init__(self, impulse_response, block_size=512, wet_level=0.3, config=None):
+        """
+        畳み込みリバーブを初期化
+        
+        Args:
+            impulse_response (np.ndarray): インパルス応答 (サンプル数,) または (サンプル数, チャンネル数)
+            block_size (int): 分割ブロックのサイズ（= レイテンシ, サンプル）
+            wet_level (float): エフェクト音のレベル (0.0-1.0)
+            config (AudioConfig): オーディオ設定
+        """
+        self.config = config or AudioConfig()
+        self.block_size = int(block_size)
+        self.wet_level = wet_level
+        self.dry_level = 1.0 - wet_level
+        
+        if self.block_size <= 0:
+            raise ValueError("block_sizeは正の整数で指定してください")
+        
+        impulse_response = np.asarray(impulse_response, dtype=np.float64)
+        if impulse_response.ndim not in (1, 2) or len(impulse_response) == 0:
+            raise ValueError("インパルス応答は (サンプル数,) または (サンプル数, チャンネル数) の配列で指定してください")
+        
+        self.impulse_response = impulse_response
+        self.ir_spectra = self._get_ir_spectra(impulse_response, self.block_size)
+        self.num_partitions = len(self.ir_spectra)
+        self.reset()
+    
+    @classmethod
+    def from_file(cls, filename, stereo=False, block_size=512, wet_level=0.3, config=None):
+        """
+        WAVファイルのインパルス応答から畳み込みリバーブを作成
+        
+        ファイルのサンプリング周波数がconfigと異なる場合はリサンプリングします。
+        
+        Args:
+            filename (str): インパルス応答のWAVファイル
+            stereo (bool): Trueならステレオのまま読み込む（Falseならモノラルにまとめる）
+            block_size (int): 分割ブロックのサイズ（サンプル）
+            wet_level (float): エフェクト音のレベル (0.0-1.0)
+            config (AudioConfig): オーディオ設定
+            
+        Returns:
+            ConvolutionReverb: 畳み込みリバーブ
+        """
+        config = config or AudioConfig()
+        
+        if stereo:
+            sample_rate, impulse_response = WaveFileIO.load_stereo(filename, config)
+        else:
+            sample_rate, impulse_response = WaveFileIO.load_mono(filename, config)
+            if impulse_response.ndim == 2:
+                impulse_response = np.mean(impulse_response, axis=1)
+        
+        if sample_rate != config.sample_rate:
+            divisor = gcd(int(config.sample_rate), int(sample_rate))
+            impulse_response = resample_poly(
+                impulse_response, config.sample_rate // divisor, sample_rate // divisor, axis=0
+            )
+        
+        return cls(impulse_response, block_size=block_size, wet_level=wet_level, config=config)
+    
+    @classmethod
+    def _get_ir_spectra(cls, impulse_response, block_size):
+        """
+        インパルス応答の分割スペクトルを取得（キャッシュ付き）
+        
+        Returns:
+            np.ndarray: 分割スペクトル (分割数, block_size + 1, チャンネル数)
+        """
+        digest = hashlib.sha1(impulse_response.tobytes()).hexdigest()
+        key = (digest, impulse_response.shape, block_size)
+        
+        if key not in cls._spectrum_cache:
+            ir = impulse_response.reshape(len(impulse_response), -1)
+            num_partitions = -(-len(ir) // block_size)  # 切り上げ
+            
+            # block_sizeごとに分割し、後半をゼロ詰めして2 * block_sizeでFFT
+            partitions = np.zeros((num_partitions * block_size, ir.shape[1]))
+            partitions[:len(ir)] = ir
+            padded = np.zeros((num_partitions, 2 * block_size, ir.shape[1]))
+            padded[:, :block_size] = partitions.reshape(num_partitions, block_size, -1)
+            spectra = np.fft.rfft(padded, axis=1)
+            spectra.flags.writeable = False
+            cls._spectrum_cache[key] = spectra
+            
+            # 古いものから捨てて上限を保つ
+            while len(cls._spectrum_cache) > cls._spectrum_cache_size:
+                cls._spectrum_cache.popitem(last=False)
+        else:
+            cls._spectrum_cache.move_to_end(key)
+        
+        return cls._spectrum_cache[key]
+    
+    @classmethod
+    def clear_cache(cls):
+        """インパルス応答スペクトルのキャッシュを消去"""
+        cls._spectrum_cache.clear()
+    
+    def reset(self):
+        """内部状態（入力履歴・出力待ちのサンプル）をリセット"""
+        self._channels = None
+    
+    def _prepare_state(self, input_channels):
+        """入力チャンネル数に合わせて状態を初期化"""
+        ir_channels = self.ir_spectra.shape[2]
+        if input_channels != ir_channels and 1 not in (input_channels, ir_channels):
+            raise ValueError(
+                f"入力のチャンネル数({input_channels})とインパルス応答のチャンネル数({ir_channels})が合いません"
+            )
+        output_channels = max(input_channels, ir_channels)
+        
+        self._channels = input_channels
+        self._output_channels = output_channels
+        self._previous_block = np.zeros((self.block_size, input_channels))
+        # 過去の入力ブロックのスペクトル（周波数領域遅延ライン）
+        self._spectra_history = np.zeros(
+            (self.num_partitions, self.block_size + 1, input_channels), dtype=np.complex128
+        )
+        self._history_index = 0
+        self._pending_input = np.zeros((0, input_channels))
+        # 1ブロック分のレイテンシ
+        self._pending_output = np.zeros((self.block_size, output_channels))
+    
+    def _process_block(self, block):
+        """1ブロック（block_sizeサンプル）を畳み込む"""
+        block_size = self.block_size
+        
+        # 直前のブロックと連結してFFT（オーバーラップセーブ）
+        frame = np.concatenate((self._previous_block, block))
+        self._spectra_history[self._history_index] = np.fft.rfft(frame, axis=0)
+        self._previous_block = block
+        
+        # 新しい入力ほど先頭の分割と掛け合わせる。リングバッファを書き込み位置で
+        # 2つのビューに分け、コピーせずに積和を計算する
+        index = self._history_index
+        history = self._spectra_history
+        spectrum = np.einsum('pkc,pkc->kc', history[index::-1], self.ir_spectra[:index + 1])
+        if index + 1 < self.num_partitions:
+            spectrum += np.einsum('pkc,pkc->kc', history[:index:-1], self.ir_spectra[index + 1:])
+        self._history_index = (index + 1) % self.num_partitions
+        
+        # 後半のblock_sizeサンプルが有効な畳み込み結果
+        wet = np.fft.irfft(spectrum, n=2 * block_size, axis=0)[block_size:]
+        return self.dry_level * block + self.wet_level * wet
+    
+    def process(self, input_signal):
+        """
+        畳み込みリバーブを適用（ストリーミング処理）
+        
+        出力は入力より1ブロック（block_sizeサンプル）遅れます。
+        任意の長さのブロックで繰り返し呼び出せます。
+        
+        Args:
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
+            
+        Returns:
+            np.ndarray: リバーブが適用された信号（入力と同じサンプル数）
+        """
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            # 空のブロックは状態を変えずに空の出力を返す
+            if x.ndim == 1 and self.impulse_response.ndim == 1:
+                return np.zeros(0)
+            channels = x.shape[1] if x.ndim == 2 else 1
+            return np.zeros((0, max(channels, self.ir_spectra.shape[2])))
+        frames = x.reshape(len(x), -1)
+        
+        if self._channels != frames.shape[1]:
+            self._prepare_state(frames.shape[1])
+        
+        pending = np.concatenate((self._pending_input, frames))
+        num_blocks = len(pending) // self.block_size
+        
+        outputs = [self._pending_output]
+        for i in range(num_blocks):
+            block = pending[i * self.block_size:(i + 1) * self.block_size]
+            outputs.append(self._process_block(block))
+        self._pending_input = pending[num_blocks * self.block_size:]
+        
+        available = np.concatenate(outputs)
+        output = available[:len(x)]
+        self._pending_output = available[len(x):]
+        
+        # モノラル入力・モノラルIRならモノラルで返す
+        if x.ndim == 1 and self.impulse_response.ndim == 1:
+            return output[:, 0]
+        return output
+    
+    def apply(self, input_signal, sample_rate=None):
+        """
+        畳み込みリバーブを適用（教育用便利メソッド）
+        
+        1ブロック分のレイテンシを補正し、入力と時間がそろった信号を返します。
+        
+        Args:
+            input_signal (np.ndarray): 入力信号
+            sample_rate (int): サンプリングレート（未使用、互換性のため）
+            
+        Returns:
+            np.ndarray: リバーブが適用された信号
+        """
+        x = np.asarray(input_signal, dtype=np.float64)
+        padding = np.zeros((self.block_size,) + x.shape[1:])
+        return self.process(np.concatenate((x, padding)))[self.block_size:]
 
 class Distortion:
     """ディストーション（歪み）エフェクト"""
     
-    def __init__(self, gain=10.0, output_level=0.5, config=None):
+    # 対応するオーバーサンプリング倍率
+    OVERSAMPLING_FACTORS = (1, 2, 4, 8)
+    
+    def __init__(self, gain=10.0, output_level=0.5, config=None, oversampling=1):
         """
         ディストーションエフェクトを初期化
         
@@ -124,21 +543,59 @@ class Distortion:
             gain (float): ゲイン（歪みの強さ）
             output_level (float): 出力レベル (0.0-1.0)
             config (AudioConfig): オーディオ設定
+            oversampling (int): オーバーサンプリング倍率 (1, 2, 4, 8)。
+                2以上では、エフェクト内部だけ高いサンプリング周波数で歪ませて
+                エイリアシングを抑える
         """
+        if (not isinstance(oversampling, (int, np.integer)) or isinstance(oversampling, bool)
+                or oversampling not in self.OVERSAMPLING_FACTORS):
+            raise ValueError(f"未対応のオーバーサンプリング倍率: {oversampling!r}")
+        oversampling = int(oversampling)
+        
         self.config = config or AudioConfig()
         self.gain = gain
         self.output_level = output_level
+        self.oversampling = oversampling
+        self.reset()
+    
+    def reset(self):
+        """リサンプラーの状態をリセット"""
+        # 入力のチャンネル構成に合わせて最初の処理時に作る
+        self._upsample_history = None
+        self._downsample_history = None
     
     def process(self, input_signal):
         """
         ディストーションエフェクトを適用
         
+        オーバーサンプリング時はリサンプラーの状態がブロック間で引き継がれます。
+        ポリフェーズフィルターにより、出力は約64サンプル遅れます。
+        
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
             
         Returns:
             np.ndarray: ディストーションが適用された信号
         """
+        if self.oversampling == 1:
+            return self._shape(input_signal)
+        
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros_like(x)
+        
+        # 履歴はチャンネルごとに持つ (タップ数 - 1, チャンネル数...)
+        if self._upsample_history is None or self._upsample_history.shape[1:] != x.shape[1:]:
+            fir = _get_oversampling_filter(self.oversampling)
+            self._upsample_history = np.zeros((len(fir) // self.oversampling - 1,) + x.shape[1:])
+            self._downsample_history = np.zeros((len(fir) - 1,) + x.shape[1:])
+        
+        upsampled = self._upsample(x)
+        distorted = self._shape(upsampled)
+        return self._downsample(distorted)
+    
+    def _shape(self, input_signal):
+        """ゲインとソフトクリッピングを適用"""
         # ゲインを適用
         amplified = input_signal * self.gain
         
@@ -147,6 +604,36 @@ class Distortion:
         
         # 出力レベルを調整
         return distorted * self.output_level
+    
+    def _upsample(self, x):
+        """ポリフェーズ補間フィルターでoversampling倍にアップサンプリング"""
+        factor = self.oversampling
+        fir = _get_oversampling_filter(factor)
+        
+        # 位相ごとの係数 (タップ数, 倍率)
+        polyphase = fir.reshape(-1, factor)
+        taps = len(polyphase)
+        
+        extended = np.concatenate((self._upsample_history, x))
+        self._upsample_history = extended[len(extended) - (taps - 1):].copy()
+        
+        # 各入力サンプルに対して、直近taps個の入力から倍率分の出力を計算
+        # windows: (サンプル数, チャンネル数..., タップ数) -> phases: (サンプル数, チャンネル数..., 倍率)
+        windows = sliding_window_view(extended, taps, axis=0)[..., ::-1]
+        phases = np.moveaxis(windows @ polyphase, -1, 1)
+        return phases.reshape((-1,) + x.shape[1:]) * factor
+    
+    def _downsample(self, upsampled):
+        """ポリフェーズ間引きフィルターで元のサンプリング周波数に戻す"""
+        factor = self.oversampling
+        fir = _get_oversampling_filter(factor)
+        
+        extended = np.concatenate((self._downsample_history, upsampled))
+        self._downsample_history = extended[len(extended) - (len(fir) - 1):].copy()
+        
+        # 残すサンプル（factorおき）の位置だけ畳み込みを計算
+        windows = sliding_window_view(extended, len(fir), axis=0)[::factor]
+        return windows @ fir[::-1]
 
     def apply(self, input_signal, sample_rate=None):
         """
@@ -184,16 +671,45 @@ class Delay:
         self.delay_buffer = np.zeros(delay_samples)
         self.delay_index = 0
     
-    def process(self, input_signal):
+    def process(self, input_signal, mode='vectorized'):
         """
         ディレイエフェクトを適用
         
+        delay_buffer/delay_indexはブロック間で引き継がれるため、
+        分割して呼び出しても一括処理と同じ結果になります。
+        
         Args:
             input_signal (np.ndarray): 入力信号
+            mode (str): 処理方式
+                'vectorized' - 遅延長ごとのブロックで一括計算（既定）
+                'reference'  - 1サンプルずつ計算する参照実装（検証用）
             
         Returns:
             np.ndarray: ディレイが適用された信号
         """
+        if mode == 'vectorized':
+            return self._process_vectorized(input_signal)
+        elif mode == 'reference':
+            return self._process_reference(input_signal)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+    
+    def _process_vectorized(self, input_signal):
+        """遅延長ごとのブロック再帰による一括処理"""
+        if len(self.delay_buffer) == 0:
+            return self._process_reference(input_signal)
+        
+        x = np.asarray(input_signal, dtype=np.float64)
+        delayed, self.delay_buffer = _process_feedback_delay_line(
+            self.delay_buffer, self.delay_index, x, self.feedback
+        )
+        self.delay_index = 0
+        
+        # 出力を計算（ドライ音 + ウェット音）
+        return self.dry_level * x + self.wet_level * delayed
+    
+    def _process_reference(self, input_signal):
+        """1サンプルずつ計算する参照実装"""
         output = np.zeros_like(input_signal)
         
         for n, x_n in enumerate(input_signal):
@@ -227,7 +743,7 @@ class Delay:
 class Chorus:
     """コーラスエフェクト（簡易版）"""
     
-    def __init__(self, rate=2.0, depth=0.002, wet_level=0.5, config=None):
+    def __init__(self, rate=2.0, depth=0.002, wet_level=0.5, config=None, voices=1):
         """
         コーラスエフェクトを初期化
         
@@ -236,31 +752,87 @@ class Chorus:
             depth (float): モジュレーションの深さ (秒)
             wet_level (float): エフェクト音のレベル (0.0-1.0)
             config (AudioConfig): オーディオ設定
+            voices (int): コーラスの声部数（LFOの位相を均等にずらす）
         """
         self.config = config or AudioConfig()
         self.rate = rate
         self.depth = depth
         self.wet_level = wet_level
         self.dry_level = 1.0 - wet_level
+        self.voices = voices
+        
+        if voices < 1:
+            raise ValueError("voicesは1以上で指定してください")
         
         # モジュレーション用のカウンター
         self.phase = 0.0
         
-        # 遅延バッファ
-        max_delay_samples = int((depth * 2) * self.config.sample_rate) + 1
+        # 遅延バッファ（線形補間のため最大遅延より1サンプル多く確保）
+        max_delay_samples = int((depth * 2) * self.config.sample_rate) + 2
         self.delay_buffer = np.zeros(max_delay_samples)
         self.buffer_index = 0
     
-    def process(self, input_signal):
+    def process(self, input_signal, mode='vectorized'):
         """
         コーラスエフェクトを適用
         
+        LFOの位相とバッファ位置はブロック間で引き継がれます。
+        
         Args:
             input_signal (np.ndarray): 入力信号
+            mode (str): 処理方式
+                'vectorized' - LFOと線形補間した遅延をブロック全体で一括計算（既定）
+                'reference'  - 1サンプルずつ計算する参照実装（補間なし・1声部のみ）
             
         Returns:
             np.ndarray: コーラスが適用された信号
         """
+        if mode == 'vectorized':
+            return self._process_vectorized(input_signal)
+        elif mode == 'reference':
+            return self._process_reference(input_signal)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+    
+    def _process_vectorized(self, input_signal):
+        """ブロック単位の処理（分数遅延の線形補間・複数声部）"""
+        x = np.asarray(input_signal, dtype=np.float64)
+        num_samples = len(x)
+        if num_samples == 0:
+            return np.zeros_like(x)
+        
+        buffer_length = len(self.delay_buffer)
+        sample_rate = self.config.sample_rate
+        
+        # バッファの内容（古い順）の後ろに入力を連結
+        extended = np.concatenate((np.roll(self.delay_buffer, -self.buffer_index), x))
+        
+        # 声部ごとにずらしたLFO (声部数, サンプル数)
+        n = np.arange(num_samples)
+        voice_offsets = np.arange(self.voices)[:, np.newaxis] / self.voices
+        lfo_phase = self.phase + n * (self.rate / sample_rate) + voice_offsets
+        lfo = np.sin(2 * np.pi * lfo_phase)
+        delay_samples = np.minimum(self.depth * (1 + lfo) * sample_rate, buffer_length - 1)
+        
+        # 遅延したサンプルを取得（線形補間）
+        read_position = buffer_length + n - delay_samples
+        index = np.floor(read_position).astype(np.int64)
+        fraction = read_position - index
+        next_index = np.minimum(index + 1, buffer_length + n)
+        delayed = (1.0 - fraction) * extended[index] + fraction * extended[next_index]
+        
+        # 出力を計算
+        output = self.dry_level * x + self.wet_level * np.mean(delayed, axis=0)
+        
+        # バッファとフェーズを更新
+        self.delay_buffer = extended[-buffer_length:].copy()
+        self.buffer_index = 0
+        self.phase = (self.phase + num_samples * self.rate / sample_rate) % 1.0
+        
+        return output
+    
+    def _process_reference(self, input_signal):
+        """1サンプルずつ計算する参照実装"""
         output = np.zeros_like(input_signal)
         
         for n, x_n in enumerate(input_signal):
@@ -272,7 +844,7 @@ class Chorus:
             delay_time = self.depth * (1 + lfo)
             delay_samples = delay_time * self.config.sample_rate
             
-            # 遅延したサンプルを取得（線形補間）
+            # 遅延したサンプルを取得（整数サンプルに切り捨て）
             delay_index = (self.buffer_index - int(delay_samples)) % len(self.delay_buffer)
             delayed_sample = self.delay_buffer[delay_index]
             
@@ -303,7 +875,7 @@ class Chorus:
 class Compressor:
     """コンプレッサー"""
     
-    def __init__(self, threshold=0.7, ratio=4.0, attack=0.01, release=0.1, config=None):
+    def __init__(self, threshold=0.7, ratio=4.0, attack=0.01, release=0.1, config=None, lookahead=0.0):
         """
         コンプレッサーを初期化
         
@@ -313,53 +885,138 @@ class Compressor:
             attack (float): アタック時間 (秒)
             release (float): リリース時間 (秒)
             config (AudioConfig): オーディオ設定
+            lookahead (float): 先読み時間 (秒)。音声をこの時間だけ遅らせ、
+                検出器が先に音量変化に反応できるようにする
         """
         self.config = config or AudioConfig()
         self.threshold = threshold
         self.ratio = ratio
         self.attack = attack
         self.release = release
+        self.lookahead = lookahead
         
-        # エンベロープフォロワー用の状態
+        # エンベロープフォロワー用の状態（どちらの処理方式でも同じ状態を進める）
         self.envelope = 0.0
+        self.peak = 0.0  # ピークホールド（リリース係数で減衰する最大値）
+        
+        # 先読み用の遅延バッファ
+        self.lookahead_buffer = np.zeros(self.config.duration_to_samples(lookahead))
         
         # 時定数の計算
         self.attack_coeff = np.exp(-1.0 / (attack * self.config.sample_rate))
         self.release_coeff = np.exp(-1.0 / (release * self.config.sample_rate))
     
-    def process(self, input_signal):
+    def process(self, input_signal, sidechain=None, mode='reference'):
         """
         コンプレッサーを適用
         
+        エンベロープフォロワーと先読みバッファの状態はブロック間で保持されます。
+        
+        'vectorized'の分離型ピーク検出器は、アタック/リリースを1サンプルずつ切り替える
+        検出器とは別の検出器です。過渡部分だけでなく定常状態のゲインも異なるため、
+        音が変わっても速度を優先する場合にだけ明示的に指定してください。
+        
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
+            sidechain (np.ndarray): 検出器に使う信号（キックなど）。Noneなら入力信号を使う
+            mode (str): 検出器の処理方式
+                'reference'  - 1サンプルずつアタック/リリースを切り替えるエンベロープフォロワー（既定）
+                'vectorized' - 分離型ピーク検出器をブロック全体の配列演算で計算（高速）
             
         Returns:
             np.ndarray: 圧縮された信号
         """
-        output = np.zeros_like(input_signal)
+        x = np.asarray(input_signal, dtype=np.float64)
+        detector_signal = x if sidechain is None else np.asarray(sidechain, dtype=np.float64)
+        if len(detector_signal) != len(x):
+            raise ValueError("サイドチェーン信号の長さが入力信号と一致しません")
         
-        for n, x_n in enumerate(input_signal):
-            # 現在のレベルを計算
-            current_level = abs(x_n)
-            
+        # 現在のレベルを計算（マルチチャンネルは最大値で連動させる）
+        levels = np.abs(detector_signal)
+        if levels.ndim > 1:
+            levels = np.max(levels.reshape(len(levels), -1), axis=1)
+        
+        if mode == 'vectorized':
+            envelope = self._follow_envelope_vectorized(levels)
+        elif mode == 'reference':
+            envelope = self._follow_envelope_reference(levels)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+        
+        gain_reduction = self._compute_gain(envelope)
+        delayed = self._apply_lookahead(x)
+        
+        # 出力を計算
+        return delayed * gain_reduction.reshape((-1,) + (1,) * (x.ndim - 1))
+    
+    def _follow_envelope_reference(self, levels):
+        """アタック/リリースを1サンプルずつ切り替えるエンベロープフォロワー（参照実装）"""
+        envelope = np.zeros(len(levels))
+        
+        for n, current_level in enumerate(levels):
             # エンベロープフォロワー
             if current_level > self.envelope:
                 self.envelope += (current_level - self.envelope) * (1 - self.attack_coeff)
             else:
                 self.envelope += (current_level - self.envelope) * (1 - self.release_coeff)
+            envelope[n] = self.envelope
             
-            # ゲインリダクションを計算
-            if self.envelope > self.threshold:
-                excess = self.envelope - self.threshold
-                gain_reduction = 1.0 - (excess / self.ratio) / self.envelope
-            else:
-                gain_reduction = 1.0
-            
-            # 出力を計算
-            output[n] = x_n * gain_reduction
+            # 途中で'vectorized'に切り替えても続きから処理できるようにピークホールドも進める
+            self.peak = max(current_level, self.release_coeff * self.peak)
         
-        return output
+        return envelope
+    
+    def _follow_envelope_vectorized(self, levels):
+        """
+        配列演算によるエンベロープフォロワー（分離型ピーク検出器）
+        
+        1. ピーク検出: peak[n] = max(level[n], release_coeff * peak[n-1])
+           対数領域では累積最大値になるため np.maximum.accumulate で計算できる
+        2. アタック平滑化: 1次IIRフィルター（lfilter）
+        """
+        if len(levels) == 0:
+            return np.zeros(0)
+        
+        log_release = np.log(self.release_coeff)
+        steps = np.arange(1, len(levels) + 1) * log_release
+        
+        with np.errstate(divide='ignore'):
+            log_levels = np.log(levels)
+            log_peak_state = np.log(self.peak)
+        
+        # log(peak[n]) = max(log_peak_state, max_{k<=n}(log(level[k]) - (k+1)*log_release)) + (n+1)*log_release
+        held = np.maximum.accumulate(np.maximum(log_levels - steps, log_peak_state))
+        peak = np.exp(held + steps)
+        self.peak = peak[-1]
+        
+        # アタック時定数で平滑化
+        envelope, _ = lfilter(
+            [1 - self.attack_coeff], [1.0, -self.attack_coeff], peak,
+            zi=[self.attack_coeff * self.envelope]
+        )
+        self.envelope = envelope[-1]
+        
+        return envelope
+    
+    def _compute_gain(self, envelope):
+        """ゲインリダクションを計算"""
+        above = envelope > self.threshold
+        safe_envelope = np.where(above, envelope, 1.0)
+        excess = envelope - self.threshold
+        return np.where(above, 1.0 - (excess / self.ratio) / safe_envelope, 1.0)
+    
+    def _apply_lookahead(self, x):
+        """音声を先読み時間だけ遅らせる"""
+        delay_samples = len(self.lookahead_buffer)
+        if delay_samples == 0:
+            return x
+        
+        if self.lookahead_buffer.shape[1:] != x.shape[1:]:
+            self.lookahead_buffer = np.zeros((delay_samples,) + x.shape[1:])
+        
+        extended = np.concatenate((self.lookahead_buffer, x))
+        self.lookahead_buffer = extended[len(x):].copy()
+        return extended[:len(x)]
 
     def apply(self, input_signal, sample_rate=None):
         """
@@ -375,7 +1032,8 @@ class Compressor:
         return self.process(input_signal)
 
 # 便利関数
-def apply_compression(signal, threshold=0.7, ratio=4.0, attack=0.01, release=0.1, config=None):
+def apply_compression(signal, threshold=0.7, ratio=4.0, attack=0.01, release=0.1, config=None,
+                      sidechain=None, lookahead=0.0, mode='reference'):
     """
     コンプレッサーを信号に適用する便利関数
     
@@ -386,9 +1044,12 @@ def apply_compression(signal, threshold=0.7, ratio=4.0, attack=0.01, release=0.1
         attack (float): アタック時間 (秒)
         release (float): リリース時間 (秒)
         config (AudioConfig): オーディオ設定
+        sidechain (np.ndarray): 検出器に使う信号。Noneなら入力信号を使う
+        lookahead (float): 先読み時間 (秒)
+        mode (str): 検出器の処理方式 ('reference' または 'vectorized'。Compressor.process を参照)
         
     Returns:
         np.ndarray: 圧縮された信号
     """
-    compressor = Compressor(threshold, ratio, attack, release, config)
-    return compressor.process(signal)
+    compressor = Compressor(threshold, ratio, attack, release, config, lookahead)
+    return compressor.process(signal, sidechain=sidechain, mode=mode)
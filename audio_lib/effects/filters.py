@@ -5,10 +5,16 @@
 """
 
 import numpy as np
+from scipy.signal import lfilter, sosfilt
 from ..core.audio_config import AudioConfig
 
 class BaseFilter:
-    """フィルターの基底クラス"""
+    """
+    フィルターの基底クラス
+    
+    入力はモノラル（サンプル数,）またはマルチチャンネル（サンプル数, チャンネル数）。
+    マルチチャンネルの場合、履歴はチャンネルごとに別々に保持されます。
+    """
     
     def __init__(self, config=None):
         self.config = config or AudioConfig()
@@ -16,6 +22,7 @@ class BaseFilter:
     
     def reset(self):
         """フィルターの状態をリセット"""
+        self.channel_shape = ()  # 状態のチャンネル構成（モノラルは空タプル）
         self.x_history = [0.0, 0.0, 0.0]  # 入力履歴
         self.y_history = [0.0, 0.0, 0.0]  # 出力履歴
     
@@ -24,12 +31,33 @@ class BaseFilter:
         信号を処理（派生クラスで実装）
         
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
             
         Returns:
             np.ndarray: フィルター処理された信号
         """
         raise NotImplementedError("派生クラスで実装してください")
+    
+    def _prepare_channels(self, input_signal):
+        """
+        入力のチャンネル構成に合わせて状態を用意
+        
+        チャンネル構成が変わった場合は、そのチャンネル数でリセットします。
+        
+        Args:
+            input_signal (np.ndarray): 入力信号
+        """
+        channel_shape = np.shape(input_signal)[1:]
+        if channel_shape != self.channel_shape:
+            self.reset()
+            self.channel_shape = channel_shape
+            self._init_channel_state(channel_shape)
+    
+    def _init_channel_state(self, channel_shape):
+        """チャンネルごとの状態を初期化（状態を持つ派生クラスで拡張）"""
+        if channel_shape:
+            self.x_history = [np.zeros(channel_shape) for _ in range(3)]
+            self.y_history = [np.zeros(channel_shape) for _ in range(3)]
 
 class BiquadFilter(BaseFilter):
     """2次IIRフィルター（バイクアッドフィルター）"""
@@ -47,19 +75,78 @@ class BiquadFilter(BaseFilter):
         self.b = b_coeffs  # 分子係数
         self.a = a_coeffs  # 分母係数
     
-    def process(self, input_signal):
+    def process(self, input_signal, mode='vectorized'):
         """
         バイクアッドフィルターで信号を処理
         
+        連続したブロックに分けて呼び出しても、x_history/y_historyを
+        引き継ぐため、信号全体を一度に処理した結果と一致します。
+        マルチチャンネル入力は全チャンネルをまとめて時間軸方向に処理します。
+        
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
+            mode (str): 処理方式
+                'vectorized' - scipy.signal.lfilterでブロック全体を一括処理（既定）
+                'reference'  - 1サンプルずつ計算する参照実装（検証用）
             
         Returns:
             np.ndarray: フィルター処理された信号
         """
+        self._prepare_channels(input_signal)
+        
+        if mode == 'vectorized':
+            return self._process_vectorized(input_signal)
+        elif mode == 'reference':
+            return self._process_reference(input_signal)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+    
+    def _process_vectorized(self, input_signal):
+        """lfilterによるブロック一括処理"""
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros_like(x)
+        
+        # a0は1.0に正規化済みとして扱う（参照実装と同じ差分方程式）
+        b = np.array(self.b[:3], dtype=np.float64)
+        a = np.array([1.0, self.a[1], self.a[2]], dtype=np.float64)
+        
+        output, _ = lfilter(b, a, x, axis=0, zi=self._history_to_zi())
+        
+        # 次のブロックのために履歴を更新（1サンプルのブロックでは1つ前の履歴を繰り下げる）
+        # 多チャンネルでは行がビューになるため、入力バッファの使い回しに備えてコピーする
+        if len(x) >= 2:
+            self.x_history[1] = x[-2].copy()
+            self.y_history[1] = output[-2].copy()
+        else:
+            self.x_history[1] = self.x_history[0]
+            self.y_history[1] = self.y_history[0]
+        self.x_history[0] = x[-1].copy()
+        self.y_history[0] = output[-1].copy()
+        
+        return output
+    
+    def _history_to_zi(self):
+        """
+        入出力履歴をlfilter（転置直接形II）の内部状態に変換
+        
+        Returns:
+            np.ndarray: lfilterのzi (2,) または (2, チャンネル数)
+        """
+        x1, x2 = self.x_history[0], self.x_history[1]
+        y1, y2 = self.y_history[0], self.y_history[1]
+        zi0 = self.b[1] * x1 + self.b[2] * x2 - self.a[1] * y1 - self.a[2] * y2
+        zi1 = self.b[2] * x1 - self.a[2] * y1
+        return np.array([zi0, zi1], dtype=np.float64)
+    
+    def _process_reference(self, input_signal):
+        """1サンプルずつ差分方程式を計算する参照実装"""
         output = np.zeros_like(input_signal)
         
         for n, x_n in enumerate(input_signal):
+            # 多チャンネルではx_nが入力配列の行のビューになるため、履歴にはコピーを保存する
+            x_n = np.array(x_n, dtype=np.float64, copy=True)
+            
             # 現在の出力を計算
             y_n = (self.b[0] * x_n + 
                    self.b[1] * self.x_history[0] + 
@@ -182,6 +269,78 @@ class BandPassFilter(BiquadFilter):
         
         super().__init__(b_coeffs, a_coeffs, config)
 
+class FilterChain(BaseFilter):
+    """
+    複数のバイクアッドフィルターを直列接続したフィルター
+    
+    各段の係数を2次セクション（SOS）行列にまとめ、
+    scipy.signal.sosfiltで信号を1回走査するだけで全段を処理します。
+    """
+    
+    def __init__(self, *filters, config=None):
+        """
+        フィルターチェーンを初期化
+        
+        Args:
+            *filters (BiquadFilter): 接続するフィルター（入力側から順に）
+            config (AudioConfig): オーディオ設定
+        
+        Example:
+            >>> chain = FilterChain(HighPassFilter(80), BandPassFilter(1000), LowPassFilter(5000))
+            >>> output = chain.process(signal)
+        """
+        if len(filters) == 0:
+            raise ValueError("フィルターを1つ以上指定してください")
+        for f in filters:
+            if not isinstance(f, BiquadFilter):
+                raise TypeError(f"BiquadFilterではありません: {type(f).__name__}")
+        
+        self.filters = list(filters)
+        
+        # 2次セクション行列 [b0, b1, b2, 1, a1, a2] を段数分積み重ねる
+        self.sos = np.array([
+            [f.b[0], f.b[1], f.b[2], 1.0, f.a[1], f.a[2]] for f in self.filters
+        ], dtype=np.float64)
+        
+        super().__init__(config or self.filters[0].config)
+        
+        # 各段がすでに持っている履歴を初期状態として引き継ぐ
+        channel_shapes = {f.channel_shape for f in self.filters}
+        if len(channel_shapes) == 1:
+            self.channel_shape = channel_shapes.pop()
+            self.zi = np.array([f._history_to_zi() for f in self.filters])
+    
+    def reset(self):
+        """フィルターの状態をリセット"""
+        super().reset()
+        self.zi = np.zeros((len(self.sos), 2))
+    
+    def _init_channel_state(self, channel_shape):
+        """チャンネルごとの状態行列（段数 x 2 x チャンネル数）を初期化"""
+        self.zi = np.zeros((len(self.sos), 2) + channel_shape)
+    
+    def process(self, input_signal):
+        """
+        全段のフィルターを一括で適用
+        
+        状態行列（段数 x 2）はブロック間で保持されるため、
+        分割して呼び出しても一括処理と同じ結果になります。
+        
+        Args:
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
+            
+        Returns:
+            np.ndarray: フィルター処理された信号
+        """
+        self._prepare_channels(input_signal)
+        
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros_like(x)
+        
+        output, self.zi = sosfilt(self.sos, x, axis=0, zi=self.zi)
+        return output
+
 class SimpleMovingAverageFilter(BaseFilter):
     """移動平均フィルター（簡単なローパス効果）"""
     
@@ -193,21 +352,67 @@ class SimpleMovingAverageFilter(BaseFilter):
             window_size (int): 窓のサイズ
             config (AudioConfig): オーディオ設定
         """
-        super().__init__(config)
         self.window_size = window_size
-        self.buffer = np.zeros(window_size)
+        super().__init__(config)
+    
+    def reset(self):
+        """フィルターの状態をリセット"""
+        super().reset()
+        self.buffer = np.zeros(self.window_size)
         self.index = 0
     
-    def process(self, input_signal):
+    def _init_channel_state(self, channel_shape):
+        """チャンネルごとのリングバッファを初期化"""
+        self.buffer = np.zeros((self.window_size,) + channel_shape)
+    
+    def process(self, input_signal, mode='vectorized'):
         """
         移動平均フィルターで信号を処理
         
+        累積和を使ってブロック全体の移動平均を一括計算するため、
+        1サンプルあたりのコストは窓のサイズに依存しません。
+        リングバッファの内容はブロック間で保持されます。
+        
         Args:
-            input_signal (np.ndarray): 入力信号
+            input_signal (np.ndarray): 入力信号 (サンプル数,) または (サンプル数, チャンネル数)
+            mode (str): 処理方式
+                'vectorized' - 累積和による一括処理（既定）
+                'reference'  - 1サンプルずつ平均を計算する参照実装（検証用）
             
         Returns:
             np.ndarray: フィルター処理された信号
         """
+        self._prepare_channels(input_signal)
+        
+        if mode == 'vectorized':
+            return self._process_vectorized(input_signal)
+        elif mode == 'reference':
+            return self._process_reference(input_signal)
+        else:
+            raise ValueError(f"未知の処理方式: {mode}")
+    
+    def _process_vectorized(self, input_signal):
+        """累積和による一括処理"""
+        x = np.asarray(input_signal, dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros_like(x)
+        
+        # リングバッファを古い順に並べ、入力の前に連結
+        history = np.roll(self.buffer, -self.index, axis=0)
+        extended = np.concatenate((history, x))
+        
+        # 窓内の合計 = 累積和の差
+        cumulative = np.cumsum(extended, axis=0)
+        output = (cumulative[self.window_size:] - cumulative[:-self.window_size]) / self.window_size
+        
+        # 最新のwindow_size個を古い順に保存（次の書き込み位置は先頭）
+        self.buffer = extended[-self.window_size:].copy()
+        self.index = 0
+        
+        return output
+    
+    def _process_reference(self, input_signal):
+        """1サンプルずつ平均を計算する参照実装"""
         output = np.zeros_like(input_signal)
         
         for n, x_n in enumerate(input_signal):
@@ -215,7 +420,7 @@ class SimpleMovingAverageFilter(BaseFilter):
             self.buffer[self.index] = x_n
             self.index = (self.index + 1) % self.window_size
             
-            # 移動平均を計算
-            output[n] = np.mean(self.buffer)
+            # 移動平均を計算（チャンネルごと）
+            output[n] = np.mean(self.buffer, axis=0)
         
         return output
@@ -5,7 +5,8 @@ instruments モジュール - 楽器クラス
 from .basic_instruments import (
     BaseInstrument, SimpleSynthesizer, Piano, Organ, Guitar, Drum
 )
+from .fm_instruments import FMSynthesizer
 
 __all__ = [
-    'BaseInstrument', 'SimpleSynthesizer', 'Piano', 'Organ', 'Guitar', 'Drum'
+    'BaseInstrument', 'SimpleSynthesizer', 'Piano', 'Organ', 'Guitar', 'Drum', 'FMSynthesizer'
 ]
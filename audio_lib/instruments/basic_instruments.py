@@ -76,13 +76,9 @@ class SimpleSynthesizer(BaseInstrument):
         # 基本波形を生成
         signal = self.oscillator.generate(frequency, duration)
         
-        # ベロシティを音量に変換
-        amplitude = velocity / 127.0
-        signal *= amplitude
-        
-        # エンベロープを適用
+        # エンベロープを適用（ベロシティのゲインと一緒に、その場で計算）
         envelope_data = self.envelope.generate(duration)
-        signal = apply_envelope(signal, envelope_data)
+        signal = apply_envelope(signal, envelope_data, gain=velocity / 127.0, out=signal)
         
         return signal
 
@@ -99,33 +95,29 @@ class BasicPiano(BaseInstrument):
         """ピアノの音を生成"""
         frequency = note_to_frequency(note_number)
         
-        # 基音
-        fundamental = self.oscillator.generate(frequency, duration)
-        
-        # 倍音を追加（ピアノらしい音色）
+        # 基音と倍音（ピアノらしい音色）
         harmonics = [
+            (1.0, 1.0),    # 基音
             (2.0, 0.5),    # 2倍音
             (3.0, 0.25),   # 3倍音
             (4.0, 0.125),  # 4倍音
             (5.0, 0.063),  # 5倍音
         ]
         
-        signal = fundamental.copy()
-        for harmonic_ratio, amplitude in harmonics:
-            harmonic = self.oscillator.generate(frequency * harmonic_ratio, duration)
-            signal += harmonic * amplitude
-        
-        # ベロシティを適用
-        amplitude = velocity / 127.0
-        signal *= amplitude
+        # 全ての倍音を1回の呼び出しで生成して合計
+        ratios, amplitudes = zip(*harmonics)
+        signal = self.oscillator.generate_batch(
+            frequency * np.array(ratios), duration, amplitudes=amplitudes
+        )
         
-        # エンベロープを適用
+        # エンベロープを適用（ベロシティのゲインと一緒に、その場で計算）
         envelope_data = self.envelope.generate(duration)
-        signal = apply_envelope(signal, envelope_data)
+        signal = apply_envelope(signal, envelope_data, gain=velocity / 127.0, out=signal)
         
         # 正規化
-        if np.max(np.abs(signal)) > 0:
-            signal = signal / np.max(np.abs(signal)) * 0.8
+        peak = np.max(np.abs(signal))
+        if peak > 0:
+            signal *= 0.8 / peak
         
         return signal
 
@@ -151,22 +143,20 @@ class BasicOrgan(BaseInstrument):
             (6.0, 0.2),    # 6倍音
         ]
         
-        signal = np.zeros(self.config.duration_to_samples(duration))
-        for harmonic_ratio, amplitude in harmonics:
-            harmonic = self.oscillator.generate(frequency * harmonic_ratio, duration)
-            signal += harmonic * amplitude
+        # 全ての倍音を1回の呼び出しで生成して合計
+        ratios, amplitudes = zip(*harmonics)
+        signal = self.oscillator.generate_batch(
+            frequency * np.array(ratios), duration, amplitudes=amplitudes
+        )
         
-        # ベロシティを適用
-        amplitude = velocity / 127.0
-        signal *= amplitude
-        
-        # エンベロープを適用
+        # エンベロープを適用（ベロシティのゲインと一緒に、その場で計算）
         envelope_data = self.envelope.generate(duration)
-        signal = apply_envelope(signal, envelope_data)
+        signal = apply_envelope(signal, envelope_data, gain=velocity / 127.0, out=signal)
         
         # 正規化
-        if np.max(np.abs(signal)) > 0:
-            signal = signal / np.max(np.abs(signal)) * 0.8
+        peak = np.max(np.abs(signal))
+        if peak > 0:
+            signal *= 0.8 / peak
         
         return signal
 
@@ -191,17 +181,14 @@ class BasicGuitar(BaseInstrument):
         # フィルターを適用
         signal = self.filter.process(signal)
         
-        # ベロシティを適用
-        amplitude = velocity / 127.0
-        signal *= amplitude
-        
-        # エンベロープを適用
+        # エンベロープを適用（ベロシティのゲインと一緒に、その場で計算）
         envelope_data = self.envelope.generate(duration)
-        signal = apply_envelope(signal, envelope_data)
+        signal = apply_envelope(signal, envelope_data, gain=velocity / 127.0, out=signal)
         
         # 正規化
-        if np.max(np.abs(signal)) > 0:
-            signal = signal / np.max(np.abs(signal)) * 0.8
+        peak = np.max(np.abs(signal))
+        if peak > 0:
+            signal *= 0.8 / peak
         
         return signal
 
@@ -254,9 +241,9 @@ class BasicDrum(BaseInstrument):
         
         if drum_type == 'kick':
             # キックドラム: 低周波のサイン波 + ピッチベンド + 音量強調
-            signal = self.oscillator.generate(base_freq, duration)
-            # ピッチベンドエフェクト（より緩やかに）
-            pitch_bend = np.exp(-np.linspace(0, 3, len(signal)))
+            # ピッチベンド: 基本周波数の2倍から基本周波数まで下降する（より緩やかに）
+            pitch_bend = np.exp(-np.linspace(0, 3, self.config.duration_to_samples(duration)))
+            signal = self.oscillator.generate(base_freq * (1.0 + pitch_bend), duration)
             signal *= pitch_bend
             
             # キック音を強調するため、低周波成分を追加
@@ -283,17 +270,14 @@ class BasicDrum(BaseInstrument):
             # 汎用ドラム音
             signal = self.noise_gen.generate_white_noise(duration)
         
-        # ベロシティを適用
-        amplitude = velocity / 127.0
-        signal *= amplitude
-        
-        # エンベロープを適用
+        # エンベロープを適用（ベロシティのゲインと一緒に、その場で計算）
         envelope_data = envelope.generate(duration)
-        signal = apply_envelope(signal, envelope_data)
+        signal = apply_envelope(signal, envelope_data, gain=velocity / 127.0, out=signal)
         
         # 正規化
-        if np.max(np.abs(signal)) > 0:
-            signal = signal / np.max(np.abs(signal)) * 0.8
+        peak = np.max(np.abs(signal))
+        if peak > 0:
+            signal *= 0.8 / peak
         
         return signal
 
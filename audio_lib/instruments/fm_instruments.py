@@ -0,0 +1,81 @@
+"""
+FM合成の楽器クラス
+
+FMAlgorithm を BaseInstrument として使えるようにし、
+エレクトリックピアノやベルなどのプリセットを提供
+"""
+
+from .basic_instruments import BaseInstrument
+from ..synthesis.fm_synthesis import FMOperator, FMAlgorithm
+from ..synthesis.envelopes import ADSREnvelope
+from ..synthesis.note_utils import note_to_frequency
+
+class FMSynthesizer(BaseInstrument):
+    """マルチオペレーターFMシンセサイザー"""
+    
+    def __init__(self, operators, connections=(), carriers=None, config=None):
+        """
+        FMシンセサイザーを初期化
+        
+        Args:
+            operators (list): FMOperator のリスト
+            connections (list): (モジュレーターの番号, キャリアの番号) のリスト
+            carriers (list): 出力に使うオペレーターの番号。Noneの場合は自動で決定
+            config (AudioConfig): オーディオ設定
+        """
+        super().__init__(config)
+        self.algorithm = FMAlgorithm(operators, connections, carriers)
+    
+    def play_note(self, note_number, velocity=100, duration=1.0):
+        """
+        音符を演奏
+        
+        Args:
+            note_number (int): MIDIノート番号
+            velocity (int): ベロシティ (0-127)
+            duration (float): 音符の長さ (秒)
+        
+        Returns:
+            np.ndarray: 生成された音声データ
+        """
+        frequency = note_to_frequency(note_number)
+        signal = self.algorithm.render(frequency, duration)
+        
+        # キャリアの数で割って振幅を1以下に保ち、ベロシティを適用
+        amplitude = velocity / 127.0
+        signal *= amplitude / max(len(self.algorithm.carriers), 1)
+        
+        return signal
+    
+    @classmethod
+    def electric_piano(cls, config=None):
+        """
+        エレクトリックピアノのプリセット
+        
+        2つのスタック（本体の音 + 高い周波数比のアタック成分「ティン」）を並列に鳴らします。
+        """
+        operators = [
+            # 本体: 1:1 のスタック
+            FMOperator(1.0, 1.0, ADSREnvelope(0.001, 1.5, 0.2, 0.1, config), config=config),
+            FMOperator(1.0, 1.8, ADSREnvelope(0.001, 0.8, 0.1, 0.1, config), config=config),
+            # ティン: 14倍の周波数で短く変調
+            FMOperator(1.0, 0.6, ADSREnvelope(0.001, 0.6, 0.0, 0.1, config), detune=1.0, config=config),
+            FMOperator(14.0, 0.9, ADSREnvelope(0.001, 0.08, 0.0, 0.05, config), config=config),
+        ]
+        return cls(operators, connections=[(1, 0), (3, 2)], config=config)
+    
+    @classmethod
+    def bell(cls, config=None):
+        """
+        ベルのプリセット
+        
+        非整数の周波数比で変調し、減衰の長い非調和な倍音を作ります。
+        サステインは0で、音の長さの間ディケイで自然に減衰します。
+        """
+        operators = [
+            FMOperator(1.0, 1.0, ADSREnvelope(0.001, 4.0, 0.0, 0.05, config), config=config),
+            FMOperator(3.5, 3.0, ADSREnvelope(0.001, 2.5, 0.0, 0.05, config), config=config),
+            FMOperator(2.0, 0.5, ADSREnvelope(0.001, 2.0, 0.0, 0.05, config), config=config),
+            FMOperator(5.19, 2.0, ADSREnvelope(0.001, 1.0, 0.0, 0.05, config), config=config),
+        ]
+        return cls(operators, connections=[(1, 0), (3, 2)], config=config)
@@ -4,14 +4,160 @@
 ADSR、リニア、コサイン型など、様々なエンベロープを提供
 """
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 from ..core.audio_config import AudioConfig
 
+def _attack_curve(n, attack_samples):
+    """ADSRのアタックカーブ（指数的に0から1へ）。nはアタック開始からのサンプル番号"""
+    return (1 - np.exp(-5 * n / attack_samples)) / (1 - np.exp(-5))
+
+def _decay_curve(n, decay_samples, sustain):
+    """ADSRのディケイカーブ（1からsustainへ）。nはディケイ開始からのサンプル番号"""
+    progress = n / decay_samples
+    return 1.0 + (sustain - 1.0) * (1 - np.exp(-5 * progress))
+
+def _release_curve(n, release_samples, initial_level):
+    """ADSRのリリースカーブ（initial_levelから指数的に減衰）。nはリリース開始からのサンプル番号"""
+    progress = n / release_samples
+    return initial_level * np.exp(-5 * progress)
+
+class EnvelopeCache:
+    """
+    エンベロープのLRUキャッシュ
+    
+    同じパラメータ・長さ・サンプリング周波数のエンベロープを1度だけ生成し、
+    読み取り専用の配列として使い回します。合計サイズがmax_bytesを超えると、
+    最も長く使われていないものから削除します。
+    
+    登録・削除・統計の更新はロックで保護されるため、複数のスレッドから共有できます。
+    """
+    
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """
+        キャッシュを初期化
+        
+        Args:
+            max_bytes (int): キャッシュするエンベロープの合計サイズの上限 (バイト)
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key, factory):
+        """
+        キャッシュからエンベロープを取得（なければ生成して登録）
+        
+        Args:
+            key (tuple): エンベロープを識別するキー
+            factory (callable): エンベロープを生成する関数
+            
+        Returns:
+            np.ndarray: 読み取り専用のエンベロープデータ
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        # 生成はロックの外で行い、他のスレッドの読み出しを止めない
+        envelope = factory()
+        envelope.setflags(write=False)
+        
+        with self._lock:
+            # 生成中に他のスレッドが登録していたらそちらを使う
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            
+            # 上限より大きいものはキャッシュしない
+            if envelope.nbytes <= self.max_bytes:
+                self._entries[key] = envelope
+                self.current_bytes += envelope.nbytes
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= evicted.nbytes
+                    self.evictions += 1
+        
+        return envelope
+    
+    def clear(self):
+        """キャッシュと統計をクリア"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self):
+        """
+        キャッシュの統計を取得
+        
+        Returns:
+            dict: ヒット数、ミス数、削除数、登録数、使用バイト数、ヒット率
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': self.hits / total if total > 0 else 0.0,
+            }
+
+# 全てのエンベロープで共有するキャッシュ
+_DEFAULT_ENVELOPE_CACHE = EnvelopeCache()
+
+def get_envelope_cache():
+    """
+    エンベロープで共有しているデフォルトのキャッシュを取得
+    
+    Returns:
+        EnvelopeCache: デフォルトのキャッシュ
+    """
+    return _DEFAULT_ENVELOPE_CACHE
+
 class BaseEnvelope:
-    """エンベロープの基底クラス"""
+    """
+    エンベロープの基底クラス
     
-    def __init__(self, config=None):
+    generate() の結果はデフォルトで共有キャッシュに保存され、同じ条件では
+    読み取り専用の同じ配列が返ります。書き換える場合はコピーしてください。
+    """
+    
+    def __init__(self, config=None, cache=True):
+        """
+        Args:
+            config (AudioConfig): オーディオ設定
+            cache (bool or EnvelopeCache): Trueなら共有キャッシュ、EnvelopeCacheならそのキャッシュを使う。
+                False/Noneならキャッシュしない
+        """
         self.config = config or AudioConfig()
+        if cache is True:
+            cache = _DEFAULT_ENVELOPE_CACHE
+        self.cache = cache if isinstance(cache, EnvelopeCache) else None
+    
+    def _cached(self, key, factory):
+        """パラメータのキーでキャッシュを引き、なければfactoryで生成"""
+        if self.cache is None:
+            return factory()
+        key = (type(self).__name__,) + key + (self.config.sample_rate,)
+        return self.cache.get(key, factory)
     
     def generate(self, duration):
         """
@@ -26,9 +172,14 @@ class BaseEnvelope:
         raise NotImplementedError("派生クラスで実装してください")
 
 class ADSREnvelope(BaseEnvelope):
-    """ADSR（Attack, Decay, Sustain, Release）エンベロープ"""
+    """
+    ADSR（Attack, Decay, Sustain, Release）エンベロープ
     
-    def __init__(self, attack=0.1, decay=0.1, sustain=0.7, release=0.2, config=None):
+    generate() で長さを指定して全体を生成するほか、note_on()/note_off() と
+    process_block() でブロックごとにストリーミング生成することもできます。
+    """
+    
+    def __init__(self, attack=0.1, decay=0.1, sustain=0.7, release=0.2, config=None, cache=True):
         """
         ADSRエンベロープを初期化
         
@@ -38,12 +189,109 @@ class ADSREnvelope(BaseEnvelope):
             sustain (float): サステインレベル (0.0-1.0)
             release (float): リリース時間 (秒)
             config (AudioConfig): オーディオ設定
+            cache (bool or EnvelopeCache): エンベロープのキャッシュ
         """
-        super().__init__(config)
+        super().__init__(config, cache)
         self.attack = attack
         self.decay = decay
         self.sustain = sustain
         self.release = release
+        self.reset()
+    
+    def reset(self):
+        """ストリーミング生成の状態をリセット（無音の状態に戻す）"""
+        self.stage = 'idle'    # 'idle', 'gate' (アタック〜サステイン), 'release'
+        self.position = 0      # 現在の段階が始まってからのサンプル数
+        self.level = 0.0       # 最後に出力したレベル
+        self.attack_level = 0.0   # アタックを始めたレベル
+        self.release_level = 0.0
+    
+    @property
+    def is_active(self):
+        """音が鳴っている（アタック〜リリースの途中）かどうか"""
+        return self.stage != 'idle'
+    
+    def note_on(self):
+        """
+        ゲートを開き、アタックから開始
+        
+        リリース中などに再トリガーした場合は、クリックが出ないように
+        0ではなく現在のレベルからアタックを始めます。
+        """
+        self.stage = 'gate'
+        self.position = 0
+        self.attack_level = self.level
+    
+    def note_off(self):
+        """ゲートを閉じ、現在のレベルからリリースを開始"""
+        if self.stage != 'gate':
+            return
+        self.stage = 'release'
+        self.position = 0
+        self.release_level = self.level
+    
+    def process_block(self, num_samples):
+        """
+        次のnum_samplesサンプルのエンベロープを生成
+        
+        ブロック内の各段階は配列演算でまとめて計算します。note_on()/note_off() は
+        ブロックの境界で呼び出します。サステイン中にnote_off()した場合、
+        結果は同じゲート時間の generate() とビット単位で一致します。
+        
+        Args:
+            num_samples (int): 生成するサンプル数
+            
+        Returns:
+            np.ndarray: エンベロープデータ
+        """
+        envelope = np.zeros(num_samples)
+        
+        if self.stage == 'gate':
+            self._process_gate(envelope)
+        elif self.stage == 'release':
+            self._process_release(envelope)
+        
+        if num_samples > 0:
+            self.level = envelope[-1]
+        return envelope
+    
+    def _process_gate(self, envelope):
+        """ゲートが開いている間（アタック・ディケイ・サステイン）を計算"""
+        num_samples = len(envelope)
+        attack_samples = self.config.duration_to_samples(self.attack)
+        decay_samples = self.config.duration_to_samples(self.decay)
+        
+        start = self.position
+        n = start + np.arange(num_samples)
+        attack_end = min(max(attack_samples - start, 0), num_samples)
+        decay_end = min(max(attack_samples + decay_samples - start, 0), num_samples)
+        
+        if attack_end > 0:
+            curve = _attack_curve(n[:attack_end], attack_samples)
+            envelope[:attack_end] = self.attack_level + (1.0 - self.attack_level) * curve
+        if decay_end > attack_end:
+            envelope[attack_end:decay_end] = _decay_curve(
+                n[attack_end:decay_end] - attack_samples, decay_samples, self.sustain
+            )
+        envelope[decay_end:] = self.sustain
+        
+        self.position += num_samples
+    
+    def _process_release(self, envelope):
+        """リリースを計算（終わったら無音に戻る）"""
+        num_samples = len(envelope)
+        release_samples = self.config.duration_to_samples(self.release)
+        
+        start = self.position
+        release_end = min(max(release_samples - start, 0), num_samples)
+        if release_end > 0:
+            envelope[:release_end] = _release_curve(
+                start + np.arange(release_end), release_samples, self.release_level
+            )
+        
+        self.position += num_samples
+        if self.position >= release_samples:
+            self.stage = 'idle'
     
     def generate(self, duration, gate_time=None):
         """
@@ -56,6 +304,11 @@ class ADSREnvelope(BaseEnvelope):
         Returns:
             np.ndarray: ADSRエンベロープデータ
         """
+        key = (self.attack, self.decay, self.sustain, self.release, duration, gate_time)
+        return self._cached(key, lambda: self._generate(duration, gate_time))
+    
+    def _generate(self, duration, gate_time):
+        """ADSRエンベロープを計算"""
         if gate_time is None:
             gate_time = max(0, duration - self.release)
         
@@ -71,17 +324,16 @@ class ADSREnvelope(BaseEnvelope):
         # アタック段階
         attack_end = min(attack_samples, num_samples)
         if attack_samples > 0:
-            for n in range(attack_end):
-                # 指数的なアタックカーブ
-                envelope[n] = (1 - np.exp(-5 * n / attack_samples)) / (1 - np.exp(-5))
+            # 指数的なアタックカーブ
+            envelope[:attack_end] = _attack_curve(np.arange(attack_end), attack_samples)
         
         # ディケイ段階
         decay_start = attack_end
         decay_end = min(decay_start + decay_samples, gate_samples, num_samples)
         if decay_samples > 0 and decay_end > decay_start:
-            for n in range(decay_start, decay_end):
-                progress = (n - decay_start) / decay_samples
-                envelope[n] = 1.0 + (self.sustain - 1.0) * (1 - np.exp(-5 * progress))
+            envelope[decay_start:decay_end] = _decay_curve(
+                np.arange(decay_end - decay_start), decay_samples, self.sustain
+            )
         
         # サステイン段階
         sustain_start = decay_end
@@ -94,16 +346,69 @@ class ADSREnvelope(BaseEnvelope):
         release_end = min(release_start + release_samples, num_samples)
         if release_samples > 0 and release_end > release_start:
             initial_level = self.sustain if release_start < len(envelope) else envelope[release_start-1]
-            for n in range(release_start, release_end):
-                progress = (n - release_start) / release_samples
-                envelope[n] = initial_level * np.exp(-5 * progress)
+            envelope[release_start:release_end] = _release_curve(
+                np.arange(release_end - release_start), release_samples, initial_level
+            )
         
         return envelope
+    
+    def to_segments(self, duration, gate_time=None):
+        """
+        generate() と同じ形のエンベロープをセグメント形式で作成
+        
+        サステイン部分は定数のセグメントになるため、長い音でもほとんどメモリを使いません。
+        ゲートがアタック中に閉じる場合、アタックはゲートで打ち切られます。
+        
+        Args:
+            duration (float): 全体の継続時間 (秒)
+            gate_time (float): ゲート時間 (秒)。Noneの場合はduration - release
+            
+        Returns:
+            SegmentEnvelope: セグメント形式のエンベロープ
+        """
+        if gate_time is None:
+            gate_time = max(0, duration - self.release)
+        
+        num_samples = self.config.duration_to_samples(duration)
+        attack_samples = self.config.duration_to_samples(self.attack)
+        decay_samples = self.config.duration_to_samples(self.decay)
+        gate_samples = self.config.duration_to_samples(gate_time)
+        release_samples = self.config.duration_to_samples(self.release)
+        release_start = min(gate_samples, num_samples)
+        
+        # 正規化した指数カーブで表すため、ディケイとリリースの終点は
+        # generate() のカーブを最後まで延ばした値にする
+        segments = []
+        attack_end = min(attack_samples, num_samples)
+        if attack_samples > 0 and min(attack_end, release_start) > 0:
+            segments.append(EnvelopeSegment(
+                0, min(attack_end, release_start), 'exponential', 0.0, 1.0, curve_length=attack_samples
+            ))
+        
+        decay_end = min(attack_end + decay_samples, gate_samples, num_samples)
+        if decay_samples > 0 and decay_end > attack_end:
+            decay_final = 1.0 + (self.sustain - 1.0) * (1 - np.exp(-5))
+            segments.append(EnvelopeSegment(
+                attack_end, decay_end - attack_end, 'exponential', 1.0, decay_final, curve_length=decay_samples
+            ))
+        
+        sustain_start = max(decay_end, attack_end)
+        if release_start > sustain_start:
+            segments.append(EnvelopeSegment(sustain_start, release_start - sustain_start, 'constant', self.sustain))
+        
+        release_end = min(release_start + release_samples, num_samples)
+        if release_samples > 0 and release_end > release_start:
+            segments.append(EnvelopeSegment(
+                release_start, release_end - release_start, 'exponential',
+                self.sustain, self.sustain * np.exp(-5), curve_length=release_samples
+            ))
+        
+        return SegmentEnvelope(segments, num_samples=num_samples, config=self.config)
 
 class LinearEnvelope(BaseEnvelope):
     """リニア（直線的）エンベロープ"""
     
-    def __init__(self, fade_in=0.01, fade_out=0.01, config=None):
+    def __init__(self, fade_in=0.01, fade_out=0.01, config=None, cache=True):
         """
         リニアエンベロープを初期化
         
@@ -111,8 +416,9 @@ class LinearEnvelope(BaseEnvelope):
             fade_in (float): フェードイン時間 (秒)
             fade_out (float): フェードアウト時間 (秒)
             config (AudioConfig): オーディオ設定
+            cache (bool or EnvelopeCache): エンベロープのキャッシュ
         """
-        super().__init__(config)
+        super().__init__(config, cache)
         self.fade_in = fade_in
         self.fade_out = fade_out
     
@@ -126,6 +432,11 @@ class LinearEnvelope(BaseEnvelope):
         Returns:
             np.ndarray: リニアエンベロープデータ
         """
+        key = (self.fade_in, self.fade_out, duration)
+        return self._cached(key, lambda: self._generate(duration))
+    
+    def _generate(self, duration):
+        """リニアエンベロープを計算"""
         num_samples = self.config.duration_to_samples(duration)
         envelope = np.ones(num_samples)
         
@@ -147,7 +458,7 @@ class LinearEnvelope(BaseEnvelope):
 class CosineEnvelope(BaseEnvelope):
     """コサイン型エンベロープ（滑らかな変化）"""
     
-    def __init__(self, attack=0.1, release=0.1, config=None):
+    def __init__(self, attack=0.1, release=0.1, config=None, cache=True):
         """
         コサインエンベロープを初期化
         
@@ -155,8 +466,9 @@ class CosineEnvelope(BaseEnvelope):
             attack (float): アタック時間 (秒)
             release (float): リリース時間 (秒)
             config (AudioConfig): オーディオ設定
+            cache (bool or EnvelopeCache): エンベロープのキャッシュ
         """
-        super().__init__(config)
+        super().__init__(config, cache)
         self.attack = attack
         self.release = release
     
@@ -171,6 +483,11 @@ class CosineEnvelope(BaseEnvelope):
         Returns:
             np.ndarray: コサインエンベロープデータ
         """
+        key = (self.attack, self.release, duration, sustain_level)
+        return self._cached(key, lambda: self._generate(duration, sustain_level))
+    
+    def _generate(self, duration, sustain_level):
+        """コサインエンベロープを計算"""
         num_samples = self.config.duration_to_samples(duration)
         envelope = np.ones(num_samples) * sustain_level
         
@@ -180,30 +497,218 @@ class CosineEnvelope(BaseEnvelope):
         # アタック（コサインカーブ）
         attack_end = min(attack_samples, num_samples)
         if attack_samples > 0:
-            for n in range(attack_end):
-                progress = n / attack_samples
-                envelope[n] = sustain_level * (0.5 - 0.5 * np.cos(np.pi * progress))
+            progress = np.arange(attack_end) / attack_samples
+            envelope[:attack_end] = sustain_level * (0.5 - 0.5 * np.cos(np.pi * progress))
         
         # リリース（コサインカーブ）
         release_start = max(0, num_samples - release_samples)
         if release_samples > 0 and release_start < num_samples:
-            for n in range(release_start, num_samples):
-                progress = (n - release_start) / release_samples
-                envelope[n] = sustain_level * (0.5 + 0.5 * np.cos(np.pi * progress))
+            progress = np.arange(num_samples - release_start) / release_samples
+            envelope[release_start:] = sustain_level * (0.5 + 0.5 * np.cos(np.pi * progress))
         
         return envelope
 
-def apply_envelope(signal, envelope):
+# セグメントのカーブ: 進行度 (0.0-1.0) -> 始点から終点への変化の割合 (0.0-1.0)
+_SEGMENT_CURVES = {
+    'constant': None,
+    'linear': lambda progress: progress,
+    'exponential': lambda progress: (1 - np.exp(-5 * progress)) / (1 - np.exp(-5)),
+    'cosine': lambda progress: 0.5 - 0.5 * np.cos(np.pi * progress),
+}
+
+class EnvelopeSegment:
+    """エンベロープの1区間（開始位置、長さ、カーブの種類、始点と終点のレベル）"""
+    
+    def __init__(self, start, length, curve='linear', start_level=0.0, end_level=None, curve_length=None):
+        """
+        セグメントを初期化
+        
+        Args:
+            start (int): 開始位置（サンプル）
+            length (int): 長さ（サンプル）
+            curve (str): カーブの種類 ('constant', 'linear', 'exponential', 'cosine')
+            start_level (float): 始点のレベル
+            end_level (float): 終点のレベル。Noneの場合はstart_levelと同じ
+            curve_length (int): カーブ全体の長さ（サンプル）。カーブを途中で打ち切る場合に指定。
+                Noneの場合はlength
+        """
+        if curve not in _SEGMENT_CURVES:
+            raise ValueError(f"未知のカーブ: {curve}")
+        
+        self.start = int(start)
+        self.length = int(length)
+        self.curve = curve
+        self.start_level = start_level
+        self.end_level = start_level if end_level is None else end_level
+        self.curve_length = self.length if curve_length is None else curve_length
+    
+    @property
+    def end(self):
+        """終了位置（サンプル、この位置は含まない）"""
+        return self.start + self.length
+    
+    @property
+    def is_constant(self):
+        """レベルが一定かどうか"""
+        return self.curve == 'constant' or self.start_level == self.end_level
+    
+    def values(self, count=None):
+        """
+        セグメントのレベルを配列として計算
+        
+        Args:
+            count (int): 先頭から計算するサンプル数。Noneの場合はセグメント全体
+            
+        Returns:
+            np.ndarray: レベルの配列
+        """
+        if count is None:
+            count = self.length
+        if self.is_constant:
+            return np.full(count, float(self.start_level))
+        
+        progress = np.arange(count) / self.curve_length
+        return self.start_level + (self.end_level - self.start_level) * _SEGMENT_CURVES[self.curve](progress)
+
+class SegmentEnvelope(BaseEnvelope):
+    """
+    セグメントの並びで表すエンベロープ
+    
+    全長の配列を作らず、apply() でセグメントごとに信号へ掛けます。
+    レベルが一定のセグメントはスカラーの掛け算になり、セグメントのない区間は0になります。
+    """
+    
+    def __init__(self, segments, num_samples=None, config=None):
+        """
+        セグメントエンベロープを初期化
+        
+        Args:
+            segments (list): EnvelopeSegment のリスト（重なってはいけない）
+            num_samples (int): 全体の長さ（サンプル）。Noneの場合は最後のセグメントの終了位置
+            config (AudioConfig): オーディオ設定
+        """
+        super().__init__(config, cache=False)
+        self.segments = sorted(segments, key=lambda segment: segment.start)
+        
+        for previous, segment in zip(self.segments, self.segments[1:]):
+            if segment.start < previous.end:
+                raise ValueError(f"セグメントが重なっています: {previous.start}-{previous.end} と {segment.start}-{segment.end}")
+        
+        if num_samples is None:
+            num_samples = self.segments[-1].end if self.segments else 0
+        self.num_samples = num_samples
+    
+    def generate(self, duration=None):
+        """
+        エンベロープを配列として生成
+        
+        Args:
+            duration (float): 継続時間 (秒)。Noneの場合は全体の長さ
+            
+        Returns:
+            np.ndarray: エンベロープデータ
+        """
+        num_samples = self.num_samples if duration is None else self.config.duration_to_samples(duration)
+        return self.apply(np.ones(num_samples))
+    
+    def apply(self, signal, gain=1.0, out=None):
+        """
+        信号にエンベロープを適用
+        
+        Args:
+            signal (np.ndarray): 入力信号
+            gain (float): エンベロープと一緒に掛けるゲイン
+            out (np.ndarray): 結果を書き込む配列（signal自身も可）。Noneの場合は新しく作る
+            
+        Returns:
+            np.ndarray: エンベロープが適用された信号（長さは信号とエンベロープの短い方）
+        """
+        length = min(len(signal), self.num_samples)
+        if out is None:
+            out = np.empty(length, dtype=np.result_type(signal, np.float64))
+        out = out[:length]
+        
+        position = 0
+        for segment in self.segments:
+            start, end = segment.start, min(segment.end, length)
+            if start >= length:
+                break
+            # セグメントの間の区間は無音
+            out[position:start] = 0.0
+            
+            if segment.is_constant:
+                np.multiply(signal[start:end], segment.start_level * gain, out=out[start:end])
+            else:
+                levels = segment.values(end - start)
+                if gain != 1.0:
+                    levels *= gain
+                np.multiply(signal[start:end], levels, out=out[start:end])
+            position = end
+        
+        out[position:] = 0.0
+        return out
+
+class BreakpointEnvelope(SegmentEnvelope):
+    """折れ点（時刻とレベルの組）を結ぶエンベロープ"""
+    
+    def __init__(self, points, curve='linear', config=None):
+        """
+        折れ点エンベロープを初期化
+        
+        Args:
+            points (list): (時刻 (秒), レベル) のリスト。時刻の順に並べる
+            curve (str or list): 折れ点の間のカーブの種類。リストで区間ごとに指定も可
+            config (AudioConfig): オーディオ設定
+        """
+        config = config or AudioConfig()
+        times = [time for time, _ in points]
+        if any(later < earlier for earlier, later in zip(times, times[1:])):
+            raise ValueError("折れ点は時刻の順に並べてください")
+        
+        num_segments = max(len(points) - 1, 0)
+        curves = [curve] * num_segments if isinstance(curve, str) else list(curve)
+        if len(curves) != num_segments:
+            raise ValueError(f"カーブの数が区間の数と一致しません: {len(curves)} != {num_segments}")
+        
+        segments = []
+        for (start_time, start_level), (end_time, end_level), segment_curve in zip(points, points[1:], curves):
+            start = config.duration_to_samples(start_time)
+            length = config.duration_to_samples(end_time) - start
+            if length > 0:
+                segments.append(EnvelopeSegment(start, length, segment_curve, start_level, end_level))
+        
+        num_samples = config.duration_to_samples(times[-1]) if points else 0
+        super().__init__(segments, num_samples=num_samples, config=config)
+        self.points = list(points)
+
+def apply_envelope(signal, envelope, gain=1.0, out=None):
     """
     信号にエンベロープを適用
     
+    ゲイン（ベロシティなど）とエンベロープを一時配列を作らずに掛けます。
+    out に signal 自身を渡すと、入力信号をその場で書き換えます。
+    
     Args:
         signal (np.ndarray): 入力信号
-        envelope (np.ndarray): エンベロープ
+        envelope (np.ndarray or SegmentEnvelope): エンベロープ
+        gain (float): エンベロープと一緒に掛けるゲイン
+        out (np.ndarray): 結果を書き込む配列。Noneの場合は新しく作る
         
     Returns:
-        np.ndarray: エンベロープが適用された信号
+        np.ndarray: エンベロープが適用された信号（長さは信号とエンベロープの短い方）
     """
+    if isinstance(envelope, SegmentEnvelope):
+        return envelope.apply(signal, gain=gain, out=out)
+    
     # 長さを合わせる
     min_length = min(len(signal), len(envelope))
-    return signal[:min_length] * envelope[:min_length]
+    if out is None:
+        out = np.empty(min_length, dtype=np.result_type(signal, envelope))
+    out = out[:min_length]
+    
+    if gain != 1.0:
+        np.multiply(signal[:min_length], gain, out=out)
+        np.multiply(out, envelope[:min_length], out=out)
+    else:
+        np.multiply(signal[:min_length], envelope[:min_length], out=out)
+    return out
@@ -0,0 +1,137 @@
+"""
+FM（周波数変調）/PM（位相変調）合成
+
+複数のオペレーター（正弦波 + エンベロープ）を組み合わせて、
+ベルやエレクトリックピアノのような複雑な倍音構造の音を作ります。
+各オペレーターは音符全体を1回の呼び出しで生成し、モジュレーターの出力を
+キャリアの位相変調入力としてまとめて渡すため、サンプルごとのループはありません。
+"""
+
+import numpy as np
+from .oscillators import SineWave
+from .envelopes import apply_envelope
+from ..core.audio_config import AudioConfig
+
+class FMOperator:
+    """FMオペレーター（正弦波オシレーター + エンベロープ）"""
+    
+    def __init__(self, ratio=1.0, level=1.0, envelope=None, detune=0.0, config=None):
+        """
+        FMオペレーターを初期化
+        
+        Args:
+            ratio (float): 基本周波数に対する周波数比
+            level (float): 出力レベル。モジュレーターとして使う場合は変調指数（ラジアン）
+            envelope (BaseEnvelope): 出力レベルのエンベロープ。Noneの場合は一定
+            detune (float): 周波数のずれ (Hz)
+            config (AudioConfig): オーディオ設定
+        """
+        self.config = config or AudioConfig()
+        self.ratio = ratio
+        self.level = level
+        self.envelope = envelope
+        self.detune = detune
+        self.oscillator = SineWave(self.config)
+    
+    def render(self, frequency, duration, phase_mod=None):
+        """
+        オペレーターの出力を生成
+        
+        Args:
+            frequency (float): 基本周波数 (Hz)
+            duration (float): 継続時間 (秒)
+            phase_mod (np.ndarray): 位相変調（単位はラジアン）。Noneの場合は変調なし
+        
+        Returns:
+            np.ndarray: オペレーターの出力
+        """
+        if phase_mod is not None:
+            # SineWave の位相変調入力は周期単位
+            phase_mod = phase_mod / (2 * np.pi)
+        
+        signal = self.oscillator.generate(frequency * self.ratio + self.detune, duration, phase_mod=phase_mod)
+        
+        if self.envelope is None:
+            signal *= self.level
+            return signal
+        return apply_envelope(signal, self.envelope.generate(duration), gain=self.level, out=signal)
+
+class FMAlgorithm:
+    """
+    オペレーターの接続（アルゴリズム）
+    
+    connections の (モジュレーター, キャリア) の組でオペレーター間の変調を指定します。
+    1つのキャリアに複数のモジュレーターをつなぐと、それらの出力の和で変調されます。
+    """
+    
+    def __init__(self, operators, connections=(), carriers=None):
+        """
+        アルゴリズムを初期化
+        
+        Args:
+            operators (list): FMOperator のリスト
+            connections (list): (モジュレーターの番号, キャリアの番号) のリスト
+            carriers (list): 出力に使うオペレーターの番号。Noneの場合は他を変調しないオペレーター全て
+        """
+        self.operators = list(operators)
+        self.connections = [tuple(connection) for connection in connections]
+        
+        num_operators = len(self.operators)
+        for modulator, carrier in self.connections:
+            if not (0 <= modulator < num_operators and 0 <= carrier < num_operators):
+                raise ValueError(f"存在しないオペレーターへの接続: {(modulator, carrier)}")
+        
+        if carriers is None:
+            modulators = {modulator for modulator, _ in self.connections}
+            carriers = [index for index in range(num_operators) if index not in modulators]
+        self.carriers = list(carriers)
+        for carrier in self.carriers:
+            if not 0 <= carrier < num_operators:
+                raise ValueError(f"存在しないオペレーターをキャリアに指定: {carrier}")
+        
+        self.render_order = self._sort_operators()
+    
+    def _sort_operators(self):
+        """モジュレーターがキャリアより先に計算されるようにオペレーターを並べる"""
+        num_operators = len(self.operators)
+        pending = [0] * num_operators
+        for _, carrier in self.connections:
+            pending[carrier] += 1
+        
+        order = []
+        ready = [index for index in range(num_operators) if pending[index] == 0]
+        while ready:
+            index = ready.pop()
+            order.append(index)
+            for modulator, carrier in self.connections:
+                if modulator == index:
+                    pending[carrier] -= 1
+                    if pending[carrier] == 0:
+                        ready.append(carrier)
+        
+        if len(order) != num_operators:
+            raise ValueError("オペレーターの接続がループしています")
+        return order
+    
+    def render(self, frequency, duration):
+        """
+        全オペレーターを計算し、キャリアの出力を合計
+        
+        Args:
+            frequency (float): 基本周波数 (Hz)
+            duration (float): 継続時間 (秒)
+        
+        Returns:
+            np.ndarray: 合成された音声データ
+        """
+        outputs = {}
+        for index in self.render_order:
+            modulators = [outputs[modulator] for modulator, carrier in self.connections if carrier == index]
+            phase_mod = np.sum(modulators, axis=0) if modulators else None
+            outputs[index] = self.operators[index].render(frequency, duration, phase_mod)
+        
+        num_samples = self.operators[0].config.duration_to_samples(duration) if self.operators else 0
+        signal = np.zeros(num_samples)
+        for index in self.carriers:
+            signal += outputs[index]
+        return signal
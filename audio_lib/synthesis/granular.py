@@ -0,0 +1,164 @@
+"""
+グラニュラー合成
+
+音源バッファから短い断片（グレイン）を切り出し、窓関数をかけて大量に重ね合わせます。
+グレインの位置・ピッチ・窓はすべて配列としてまとめて計算し、
+出力への足し込みも np.bincount による一括加算で行います。
+"""
+
+from math import gcd
+
+import numpy as np
+from scipy.signal import get_window, resample_poly
+from ..core.audio_config import AudioConfig
+from ..core.wave_io import WaveFileIO
+
+# (窓の種類, グレイン長) -> 窓関数。全インスタンスで共有する
+_GRAIN_WINDOWS = {}
+
+def _get_grain_window(window, length):
+    """
+    グレイン用の窓関数を取得（キャッシュ付き）
+    
+    Args:
+        window (str): 窓の種類 ('hann', 'blackman' など scipy.signal.get_window の名前)
+        length (int): グレイン長（サンプル）
+    
+    Returns:
+        np.ndarray: 読み取り専用の窓関数
+    """
+    key = (window, length)
+    if key not in _GRAIN_WINDOWS:
+        values = get_window(window, length, fftbins=False)
+        values.setflags(write=False)
+        _GRAIN_WINDOWS[key] = values
+    return _GRAIN_WINDOWS[key]
+
+class GranularSynth:
+    """グラニュラーシンセサイザー"""
+    
+    def __init__(self, source, grain_duration=0.05, density=200.0, window='hann',
+                 config=None, seed=None, chunk_size=1024):
+        """
+        グラニュラーシンセサイザーを初期化
+        
+        Args:
+            source (np.ndarray): 音源（モノラル）
+            grain_duration (float): グレインの長さ (秒)
+            density (float): 1秒あたりのグレイン数
+            window (str): グレインの窓関数の種類
+            config (AudioConfig): オーディオ設定
+            seed (int): 位置・ピッチのばらつきに使う乱数のシード
+            chunk_size (int): 一度に計算するグレイン数（メモリ使用量の上限を決める）
+        """
+        self.config = config or AudioConfig()
+        self.source = np.asarray(source, dtype=np.float64)
+        if self.source.ndim != 1:
+            raise ValueError(f"音源はモノラルである必要があります: {self.source.shape}")
+        # 両端に0を1サンプルずつ足して、範囲外の読み出しを0にする
+        self._padded_source = np.concatenate([[0.0], self.source, [0.0]])
+        
+        self.grain_duration = grain_duration
+        self.density = density
+        self.window = window
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+    
+    @classmethod
+    def from_file(cls, filename, config=None, **kwargs):
+        """
+        WAVファイルを音源としてグラニュラーシンセサイザーを作成
+        
+        ファイルのサンプリング周波数がconfigと異なる場合はリサンプリングします。
+        
+        Args:
+            filename (str): 音源のWAVファイル
+            config (AudioConfig): オーディオ設定
+            **kwargs: GranularSynth の他の引数
+        
+        Returns:
+            GranularSynth: グラニュラーシンセサイザー
+        """
+        config = config or AudioConfig()
+        
+        sample_rate, source = WaveFileIO.load_mono(filename, config)
+        if source.ndim == 2:
+            source = np.mean(source, axis=1)
+        
+        if sample_rate != config.sample_rate:
+            divisor = gcd(int(config.sample_rate), int(sample_rate))
+            source = resample_poly(source, config.sample_rate // divisor, sample_rate // divisor)
+        
+        return cls(source, config=config, **kwargs)
+    
+    def generate(self, duration, position=0.0, scan_rate=1.0, pitch=1.0,
+                 position_jitter=0.0, pitch_jitter=0.0, amplitude=1.0):
+        """
+        グレインを重ね合わせた音を生成
+        
+        Args:
+            duration (float): 継続時間 (秒)
+            position (float): 最初のグレインを読み出す音源上の位置 (秒)
+            scan_rate (float): 出力1秒あたりに読み出し位置が進む時間 (秒)。0で同じ位置に固定（フリーズ）
+            pitch (float): 再生速度の比（2.0で1オクターブ上）
+            position_jitter (float): 読み出し位置のばらつき (秒)
+            pitch_jitter (float): ピッチのばらつき (セント)
+            amplitude (float): 各グレインの振幅
+        
+        Returns:
+            np.ndarray: 生成された音声データ
+        """
+        sample_rate = self.config.sample_rate
+        num_samples = self.config.duration_to_samples(duration)
+        grain_length = self.config.duration_to_samples(self.grain_duration)
+        output = np.zeros(num_samples)
+        if num_samples == 0 or grain_length == 0:
+            return output
+        
+        # グレインの開始時刻（出力上）を等間隔に並べる
+        num_grains = int(np.ceil(duration * self.density))
+        onsets = (np.arange(num_grains) * sample_rate / self.density).astype(np.int64)
+        onsets = onsets[onsets < num_samples]
+        num_grains = len(onsets)
+        
+        # グレインごとの読み出し位置とピッチ
+        read_starts = (position + scan_rate * onsets / sample_rate) * sample_rate
+        if position_jitter > 0:
+            read_starts = read_starts + self.rng.uniform(-1.0, 1.0, num_grains) * position_jitter * sample_rate
+        ratios = np.full(num_grains, float(pitch))
+        if pitch_jitter > 0:
+            ratios = ratios * 2.0 ** (self.rng.uniform(-1.0, 1.0, num_grains) * pitch_jitter / 1200.0)
+        
+        window = _get_grain_window(self.window, grain_length) * amplitude
+        offsets = np.arange(grain_length)
+        
+        # グレインをまとめて計算し、出力へ一括で足し込む
+        for start in range(0, num_grains, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            
+            read_positions = read_starts[chunk, np.newaxis] + ratios[chunk, np.newaxis] * offsets
+            grains = self._read_source(read_positions) * window
+            
+            # チャンクのグレインが書き込む範囲だけに足し込む（出力全体を確保しない）
+            chunk_onsets = onsets[chunk]
+            span_start = chunk_onsets[0]
+            span_length = min(chunk_onsets[-1] + grain_length, num_samples) - span_start
+            write_positions = chunk_onsets[:, np.newaxis] - span_start + offsets
+            inside = write_positions < span_length
+            output[span_start:span_start + span_length] += np.bincount(
+                write_positions[inside], weights=grains[inside], minlength=span_length
+            )
+        
+        return output
+    
+    def _read_source(self, positions):
+        """音源を線形補間で読み出す（範囲外は0）"""
+        index = np.floor(positions).astype(np.int64)
+        fraction = positions - index
+        padded = self._padded_source
+        index = np.clip(index + 1, 0, len(padded) - 2)
+        
+        values = (1.0 - fraction) * padded[index] + fraction * padded[index + 1]
+        outside = (positions <= -1.0) | (positions >= len(self.source))
+        values[outside] = 0.0
+        return values
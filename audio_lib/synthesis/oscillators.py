@@ -5,13 +5,109 @@
 """
 
 import numpy as np
+from scipy.signal import lfilter
 from ..core.audio_config import AudioConfig
 
 class BaseOscillator:
-    """オシレーターの基底クラス"""
+    """
+    オシレーターの基底クラス
+    
+    generate() は毎回位相0（または指定位相）から波形を作ります。
+    長い音をブロックごとに途切れなく生成したい場合は、位相を保持する
+    generate_block() を使います。
+    """
     
     def __init__(self, config=None):
         self.config = config or AudioConfig()
+        self.frequency = None  # generate_block() で使う周波数
+        self.reset_phase()
+    
+    def reset_phase(self, phase=0.0):
+        """
+        generate_block() 用の位相アキュムレーターをリセット
+        
+        Args:
+            phase (float): 初期位相 (0.0-1.0)
+        """
+        self.phase = phase % 1.0
+    
+    def generate_block(self, num_samples, frequency=None):
+        """
+        位相を引き継ぎながら次のnum_samplesサンプルを生成
+        
+        呼び出しごとに位相アキュムレーターを進めるため、
+        ブロックを連結してもクリックのない連続した波形になります。
+        
+        Args:
+            num_samples (int): 生成するサンプル数
+            frequency (float or np.ndarray): 周波数 (Hz)。Noneの場合は前回の周波数を使う。
+                長さnum_samplesの配列を渡すとサンプルごとに周波数が変わり、
+                最後の値が次のブロックの周波数になる
+            
+        Returns:
+            np.ndarray: 生成された波形データ
+        """
+        if frequency is not None and np.ndim(frequency) > 0:
+            frequency = self._check_frequency_array(frequency, num_samples)
+            increments = frequency / self.config.sample_rate
+            phase = (self.phase + _accumulate_phase(increments)) % 1.0
+            self.phase = (self.phase + np.sum(increments)) % 1.0
+            self.frequency = float(frequency[-1]) if num_samples > 0 else self.frequency
+            return self._waveform(phase, frequency)
+        
+        if frequency is not None:
+            self.frequency = frequency
+        if self.frequency is None:
+            raise ValueError("周波数が設定されていません")
+        
+        increment = self.frequency / self.config.sample_rate
+        phase = (self.phase + increment * np.arange(num_samples)) % 1.0
+        self.phase = (self.phase + increment * num_samples) % 1.0
+        
+        return self._waveform(phase, self.frequency)
+    
+    def generate_batch(self, frequencies, duration, phases=None, amplitudes=None):
+        """
+        複数の周波数の波形を一度に生成
+        
+        時間軸を1つだけ作り、(周波数の数, サンプル数) の配列を
+        ブロードキャスト演算でまとめて計算します。倍音の重ね合わせや和音に使います。
+        
+        Args:
+            frequencies (array-like): 周波数のリスト (Hz)
+            duration (float): 継続時間 (秒)
+            phases (array-like): 各周波数の初期位相 (0.0-1.0)。Noneの場合はすべて0
+            amplitudes (array-like): 各周波数の振幅。指定すると重み付きで合計した1本の信号を返す
+            
+        Returns:
+            np.ndarray: (周波数の数, サンプル数) の波形データ。
+                amplitudesを指定した場合は合計した (サンプル数,) の信号
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64).reshape(-1, 1)
+        if phases is None:
+            phases = np.zeros_like(frequencies)
+        else:
+            phases = np.asarray(phases, dtype=np.float64).reshape(-1, 1)
+        
+        t = self._create_time_array(duration)
+        waves = self._waveform((frequencies * t + phases) % 1.0, frequencies)
+        
+        if amplitudes is None:
+            return waves
+        return np.asarray(amplitudes, dtype=np.float64) @ waves
+    
+    def _waveform(self, phase, frequency):
+        """
+        位相から波形を計算（generate_block()/generate_batch() を使う派生クラスで実装）
+        
+        Args:
+            phase (np.ndarray): 位相 (0.0-1.0)
+            frequency (float or np.ndarray): 周波数 (Hz)。generate_batch() では (周波数の数, 1) の配列
+            
+        Returns:
+            np.ndarray: 波形データ
+        """
+        raise NotImplementedError("派生クラスで実装してください")
     
     def generate(self, frequency, duration, phase=0.0):
         """
@@ -31,40 +127,170 @@ class BaseOscillator:
         """時間軸配列を作成"""
         num_samples = self.config.duration_to_samples(duration)
         return np.linspace(0, duration, num_samples, endpoint=False)
+    
+    def _check_frequency_array(self, frequency, num_samples):
+        """サンプルごとの周波数配列の長さを確認"""
+        frequency = np.asarray(frequency, dtype=np.float64)
+        if frequency.shape != (num_samples,):
+            raise ValueError(f"周波数配列の長さがサンプル数と一致しません: {frequency.shape} != ({num_samples},)")
+        return frequency
+    
+    def _phase_signal(self, frequency, duration, phase=0.0, phase_mod=None):
+        """
+        generate() 用の位相 (0.0-1.0) を計算
+        
+        周波数がスカラーなら時間軸から直接、配列なら瞬時周波数の累積和で位相を求めます。
+        
+        Args:
+            frequency (float or np.ndarray): 周波数 (Hz)、またはサンプルごとの周波数の配列
+            duration (float): 継続時間 (秒)
+            phase (float): 初期位相 (0.0-1.0)
+            phase_mod (float or np.ndarray): 位相変調（単位は周期、サンプルごとの配列も可）
+            
+        Returns:
+            tuple: (位相の配列, 波形計算に使う周波数)
+        """
+        if np.ndim(frequency) == 0:
+            t = self._create_time_array(duration)
+            phase_signal = frequency * t + phase
+        else:
+            num_samples = self.config.duration_to_samples(duration)
+            frequency = self._check_frequency_array(frequency, num_samples)
+            phase_signal = phase + _accumulate_phase(frequency / self.config.sample_rate)
+        
+        if phase_mod is not None:
+            phase_signal = phase_signal + phase_mod
+        
+        return phase_signal % 1.0, frequency
+
+def _accumulate_phase(increments):
+    """サンプルごとの位相増分から、各サンプルの先頭時点の位相（周期単位）を計算"""
+    phase = np.empty_like(increments)
+    if len(increments) > 0:
+        phase[0] = 0.0
+        np.cumsum(increments[:-1], out=phase[1:])
+    return phase
 
 class SineWave(BaseOscillator):
     """正弦波オシレーター"""
     
-    def generate(self, frequency, duration, phase=0.0):
+    def generate(self, frequency, duration, phase=0.0, phase_mod=None):
         """
         正弦波を生成
         
         Args:
-            frequency (float): 周波数 (Hz)
+            frequency (float or np.ndarray): 周波数 (Hz)。サンプルごとの配列を渡すと
+                ビブラートやピッチスイープになる
             duration (float): 継続時間 (秒)
             phase (float): 初期位相 (0.0-1.0)
+            phase_mod (float or np.ndarray): 位相変調（単位は周期）。FM/PM合成に使う
             
         Returns:
             np.ndarray: 正弦波データ
         """
+        if np.ndim(frequency) > 0 or phase_mod is not None:
+            phase_signal, frequency = self._phase_signal(frequency, duration, phase, phase_mod)
+            return self._waveform(phase_signal, frequency)
+        
         t = self._create_time_array(duration)
         return np.sin(2 * np.pi * frequency * t + 2 * np.pi * phase)
+    
+    def _waveform(self, phase, frequency):
+        """位相から正弦波を計算"""
+        return np.sin(2 * np.pi * phase)
+
+# 不連続点のアンチエイリアシング方式
+ANTIALIAS_MODES = (None, 'polyblep')
+
+def _check_antialias(antialias):
+    """アンチエイリアシング方式を検証"""
+    if antialias not in ANTIALIAS_MODES:
+        raise ValueError(f"未知のアンチエイリアシング方式: {antialias}")
+    return antialias
+
+def _poly_blep(phase, increment):
+    """
+    PolyBLEP補正（段差の前後2サンプルを滑らかにする多項式）
+    
+    Args:
+        phase (np.ndarray): 段差を0とした位相 (0.0-1.0)
+        increment (float or np.ndarray): 1サンプルあたりの位相増分 (周波数 / サンプリング周波数)
+        
+    Returns:
+        np.ndarray: 高さ2の上昇段差に対する補正値
+    """
+    increment = np.broadcast_to(np.minimum(increment, 0.5), np.shape(phase))
+    correction = np.zeros(np.shape(phase))
+    
+    # 段差の直後
+    after = phase < increment
+    x = phase[after] / increment[after]
+    correction[after] = 2 * x - x * x - 1
+    
+    # 段差の直前
+    before = phase > 1 - increment
+    x = (phase[before] - 1) / increment[before]
+    correction[before] = x * x + 2 * x + 1
+    
+    return correction
+
+def _poly_blamp(phase, increment):
+    """
+    PolyBLAMP補正（傾きの折れ曲がりの前後2サンプルを滑らかにする多項式）
+    
+    Args:
+        phase (np.ndarray): 折れ点を0とした位相 (0.0-1.0)
+        increment (float or np.ndarray): 1サンプルあたりの位相増分
+        
+    Returns:
+        np.ndarray: 補正値（傾きの変化量と位相増分を掛けて使う）
+    """
+    increment = np.broadcast_to(np.minimum(increment, 0.5), np.shape(phase))
+    correction = np.zeros(np.shape(phase))
+    
+    after = phase < increment
+    x = phase[after] / increment[after] - 1
+    correction[after] = -x ** 3 / 3
+    
+    before = phase > 1 - increment
+    x = (phase[before] - 1) / increment[before] + 1
+    correction[before] = x ** 3 / 3
+    
+    return correction
 
 class SawtoothWave(BaseOscillator):
     """ノコギリ波オシレーター（バンドリミット処理付き）"""
     
-    def generate(self, frequency, duration, phase=0.0):
+    def __init__(self, config=None, antialias=None):
+        """
+        ノコギリ波オシレーターを初期化
+        
+        Args:
+            config (AudioConfig): オーディオ設定
+            antialias (str): アンチエイリアシング方式
+                None       - 高い周波数では正弦波で近似する簡易処理
+                'polyblep' - PolyBLEPで段差を補正（全周波数でノコギリ波のまま）
+        """
+        super().__init__(config)
+        self.antialias = _check_antialias(antialias)
+    
+    def generate(self, frequency, duration, phase=0.0, phase_mod=None):
         """
         ノコギリ波を生成
         
         Args:
-            frequency (float): 周波数 (Hz)  
+            frequency (float or np.ndarray): 周波数 (Hz)、またはサンプルごとの周波数の配列
             duration (float): 継続時間 (秒)
             phase (float): 初期位相 (0.0-1.0)
+            phase_mod (float or np.ndarray): 位相変調（単位は周期）
             
         Returns:
             np.ndarray: ノコギリ波データ
         """
+        if self.antialias == 'polyblep' or np.ndim(frequency) > 0 or phase_mod is not None:
+            phase_signal, frequency = self._phase_signal(frequency, duration, phase, phase_mod)
+            return self._waveform(phase_signal, frequency)
+        
         t = self._create_time_array(duration)
         
         # 位相を考慮したノコギリ波
@@ -77,62 +303,486 @@ class SawtoothWave(BaseOscillator):
             return np.sin(2 * np.pi * frequency * t + 2 * np.pi * phase)
         
         return signal
+    
+    def _waveform(self, phase, frequency):
+        """位相からノコギリ波を計算（generate() と同じバンドリミット処理）"""
+        if self.antialias == 'polyblep':
+            increment = frequency / self.config.sample_rate
+            # 位相0で-2の段差
+            return 2.0 * phase - 1.0 - _poly_blep(phase, increment)
+        
+        signal = 2.0 * phase - 1.0
+        high = np.asarray(frequency) > self.config.sample_rate / 8
+        if np.any(high):
+            signal = np.where(high, np.sin(2 * np.pi * phase), signal)
+        return signal
 
 class SquareWave(BaseOscillator):
     """矩形波オシレーター"""
     
-    def generate(self, frequency, duration, phase=0.0, duty_cycle=0.5):
+    def __init__(self, config=None, duty_cycle=0.5, antialias=None):
+        """
+        矩形波オシレーターを初期化
+        
+        Args:
+            config (AudioConfig): オーディオ設定
+            duty_cycle (float): 既定のデューティ比 (0.0-1.0)。generate_block()/generate_batch() と、
+                duty_cycleを省略した generate() で使う
+            antialias (str): アンチエイリアシング方式 (None または 'polyblep')
+        """
+        super().__init__(config)
+        self.duty_cycle = duty_cycle
+        self.antialias = _check_antialias(antialias)
+    
+    def generate(self, frequency, duration, phase=0.0, duty_cycle=None, phase_mod=None):
         """
         矩形波を生成
         
         Args:
-            frequency (float): 周波数 (Hz)
+            frequency (float or np.ndarray): 周波数 (Hz)、またはサンプルごとの周波数の配列
             duration (float): 継続時間 (秒)
             phase (float): 初期位相 (0.0-1.0)
-            duty_cycle (float): デューティ比 (0.0-1.0)
+            duty_cycle (float or np.ndarray): デューティ比 (0.0-1.0)。Noneの場合はコンストラクタで指定した値。
+                サンプルごとの配列を渡すとパルス幅変調（PWM）になる
+            phase_mod (float or np.ndarray): 位相変調（単位は周期）
             
         Returns:
             np.ndarray: 矩形波データ
         """
-        t = self._create_time_array(duration)
+        if duty_cycle is None:
+            duty_cycle = self.duty_cycle
         
         # 位相を考慮した矩形波
-        phase_signal = (frequency * t + phase) % 1.0
+        phase_signal, frequency = self._phase_signal(frequency, duration, phase, phase_mod)
         
-        # デューティ比に基づいて矩形波を生成
-        signal = np.where(phase_signal < duty_cycle, 1.0, -1.0)
+        return self._square(phase_signal, frequency, duty_cycle)
+    
+    def _waveform(self, phase, frequency):
+        """位相から矩形波を計算"""
+        return self._square(phase, frequency, self.duty_cycle)
+    
+    def _square(self, phase, frequency, duty_cycle):
+        """デューティ比に基づいて矩形波を生成"""
+        signal = np.where(phase < duty_cycle, 1.0, -1.0)
+        
+        if self.antialias == 'polyblep':
+            increment = frequency / self.config.sample_rate
+            # 位相0で上昇、位相duty_cycleで下降する段差を補正
+            signal = signal + _poly_blep(phase, increment)
+            signal = signal - _poly_blep((phase - duty_cycle) % 1.0, increment)
         
         return signal
 
 class TriangleWave(BaseOscillator):
     """三角波オシレーター"""
     
-    def generate(self, frequency, duration, phase=0.0):
+    def __init__(self, config=None, antialias=None):
+        """
+        三角波オシレーターを初期化
+        
+        Args:
+            config (AudioConfig): オーディオ設定
+            antialias (str): アンチエイリアシング方式 (None または 'polyblep')。
+                'polyblep' では折れ点をPolyBLAMPで補正する
+        """
+        super().__init__(config)
+        self.antialias = _check_antialias(antialias)
+    
+    def generate(self, frequency, duration, phase=0.0, phase_mod=None):
         """
         三角波を生成
         
         Args:
-            frequency (float): 周波数 (Hz)
+            frequency (float or np.ndarray): 周波数 (Hz)、またはサンプルごとの周波数の配列
             duration (float): 継続時間 (秒)
             phase (float): 初期位相 (0.0-1.0)
+            phase_mod (float or np.ndarray): 位相変調（単位は周期）
             
         Returns:
             np.ndarray: 三角波データ
         """
-        t = self._create_time_array(duration)
-        
         # 位相を考慮した三角波
-        phase_signal = (frequency * t + phase) % 1.0
+        phase_signal, frequency = self._phase_signal(frequency, duration, phase, phase_mod)
         
+        return self._waveform(phase_signal, frequency)
+    
+    def _waveform(self, phase, frequency):
+        """位相から三角波を計算"""
         # 三角波の生成
-        signal = np.where(phase_signal < 0.5, 
-                         4.0 * phase_signal - 1.0,  # 上昇部
-                         3.0 - 4.0 * phase_signal)  # 下降部
+        signal = np.where(phase < 0.5, 
+                          4.0 * phase - 1.0,  # 上昇部
+                          3.0 - 4.0 * phase)  # 下降部
+        
+        if self.antialias == 'polyblep':
+            increment = frequency / self.config.sample_rate
+            # 位相0（谷）と位相0.5（山）の折れ点を補正
+            corners = _poly_blamp(phase, increment) - _poly_blamp((phase + 0.5) % 1.0, increment)
+            signal = signal + 4.0 * increment * corners
         
         return signal
 
+# (波形, サンプリング周波数, テーブルサイズ) -> ミップマップ化したウェーブテーブル
+# 全インスタンスで共有する
+_WAVETABLE_CACHE = {}
+
+# 最も低いミップマップが受け持つ周波数 (Hz)
+_WAVETABLE_BASE_FREQUENCY = 20.0
+
+def _harmonic_amplitudes(waveform, num_harmonics):
+    """
+    波形のフーリエ級数係数を返す
+    
+    Returns:
+        tuple: (倍音番号の配列, 振幅の配列, 余弦成分ならTrue)
+    """
+    k = np.arange(1, num_harmonics + 1)
+    odd = (k % 2 == 1)
+    
+    if waveform == 'sine':
+        return k[:1], np.ones(1), False
+    elif waveform == 'sawtooth':
+        # 2 * phase - 1 = -(2/π) Σ sin(2πkx) / k
+        return k, -2.0 / (np.pi * k), False
+    elif waveform == 'square':
+        # デューティ比50%: (4/π) Σ_奇数 sin(2πkx) / k
+        return k[odd], 4.0 / (np.pi * k[odd]), False
+    elif waveform == 'triangle':
+        # TriangleWaveと同じ位相: -(8/π²) Σ_奇数 cos(2πkx) / k²
+        return k[odd], -8.0 / (np.pi ** 2 * k[odd] ** 2), True
+    raise ValueError(f"未知の波形: {waveform}")
+
+def _get_wavetables(waveform, sample_rate, table_size):
+    """
+    オクターブごとのバンドリミット・ウェーブテーブルを取得（キャッシュ付き）
+    
+    レベルkは基準周波数 * 2**k 以上 2**(k+1) 未満の音を受け持ち、
+    その上限の周波数でもナイキスト周波数を超えない倍音だけを含みます。
+    
+    Returns:
+        np.ndarray: テーブル (レベル数, table_size + 1)。最後の列は補間用に先頭を複製
+    """
+    key = (waveform, sample_rate, table_size)
+    if key not in _WAVETABLE_CACHE:
+        nyquist = sample_rate / 2
+        num_levels = max(1, int(np.ceil(np.log2(nyquist / _WAVETABLE_BASE_FREQUENCY))))
+        tables = np.zeros((num_levels, table_size + 1))
+        
+        for level in range(num_levels):
+            top_frequency = _WAVETABLE_BASE_FREQUENCY * 2 ** (level + 1)
+            num_harmonics = int(np.clip(nyquist // top_frequency, 1, table_size // 2 - 1))
+            harmonics, amplitudes, is_cosine = _harmonic_amplitudes(waveform, num_harmonics)
+            
+            # 逆FFTで1周期分を合成
+            spectrum = np.zeros(table_size // 2 + 1, dtype=np.complex128)
+            spectrum[harmonics] = amplitudes * table_size / 2 * (1.0 if is_cosine else -1j)
+            tables[level, :table_size] = np.fft.irfft(spectrum, n=table_size)
+        
+        tables[:, table_size] = tables[:, 0]
+        tables.flags.writeable = False
+        _WAVETABLE_CACHE[key] = tables
+    
+    return _WAVETABLE_CACHE[key]
+
+class WavetableOscillator(BaseOscillator):
+    """
+    ミップマップ化したバンドリミット・ウェーブテーブルオシレーター
+    
+    オクターブごとに倍音数を制限したテーブルを1度だけ作り、全インスタンスで共有します。
+    テーブルの線形補間で読み出すため、1サンプルあたりのコストは倍音数によらず一定で、
+    高い音でもエイリアシングが起きません。
+    """
+    
+    WAVEFORMS = ('sine', 'sawtooth', 'square', 'triangle')
+    
+    def __init__(self, waveform='sawtooth', config=None, table_size=2048):
+        """
+        ウェーブテーブルオシレーターを初期化
+        
+        Args:
+            waveform (str): 波形 ('sine', 'sawtooth', 'square', 'triangle')
+            config (AudioConfig): オーディオ設定
+            table_size (int): 1周期あたりのテーブルサイズ
+        """
+        if waveform not in self.WAVEFORMS:
+            raise ValueError(f"未知の波形: {waveform}")
+        
+        super().__init__(config)
+        self.waveform = waveform
+        self.table_size = table_size
+        self.tables = _get_wavetables(waveform, self.config.sample_rate, table_size)
+    
+    def generate(self, frequency, duration, phase=0.0, phase_mod=None):
+        """
+        バンドリミット波形を生成
+        
+        Args:
+            frequency (float or np.ndarray): 周波数 (Hz)、またはサンプルごとの周波数の配列。
+                配列の場合はサンプルごとにミップマップを選ぶ
+            duration (float): 継続時間 (秒)
+            phase (float): 初期位相 (0.0-1.0)
+            phase_mod (float or np.ndarray): 位相変調（単位は周期）
+            
+        Returns:
+            np.ndarray: 波形データ
+        """
+        phase_signal, frequency = self._phase_signal(frequency, duration, phase, phase_mod)
+        return self._waveform(phase_signal, frequency)
+    
+    def _waveform(self, phase, frequency):
+        """周波数に応じたミップマップを選び、テーブルを線形補間で読み出す"""
+        # 周波数からミップマップのレベルを選択（周波数の配列にも対応）
+        octave = np.log2(np.maximum(frequency, _WAVETABLE_BASE_FREQUENCY) / _WAVETABLE_BASE_FREQUENCY)
+        level = np.minimum(octave.astype(np.int64), len(self.tables) - 1)
+        
+        position = phase * self.table_size
+        index = position.astype(np.int64)
+        fraction = position - index
+        # 負のごく小さな位相では phase % 1.0 が丸めで1.0になるため、インデックスを周期で折り返す
+        index %= self.table_size
+        
+        return (1.0 - fraction) * self.tables[level, index] + fraction * self.tables[level, index + 1]
+
+class AdditiveOscillator(BaseOscillator):
+    """
+    多数の部分音を重ね合わせる加算合成オシレーター
+    
+    部分音ごとに np.sin を計算する代わりに、各部分音を減衰付きの複素回転
+    exp((-d + iω) t) として扱います。ブロック内の回転 exp((-d + iω) m / fs) と
+    各ブロック先頭の係数をそれぞれ1度だけ計算し、行列積1回で全ブロックを合成するため、
+    exp の計算回数はサンプル数×部分音数ではなく (ブロック数 + ブロック長)×部分音数で済みます。
+    """
+    
+    def __init__(self, ratios, amplitudes=None, decays=None, config=None, block_size=256):
+        """
+        加算合成オシレーターを初期化
+        
+        Args:
+            ratios (array-like): 基本周波数に対する各部分音の周波数比
+            amplitudes (array-like): 各部分音の振幅。Noneの場合は 1/部分音番号
+            decays (array-like): 各部分音の減衰率 (1/秒)。振幅は exp(-decay * t) で減衰。Noneの場合は減衰なし
+            config (AudioConfig): オーディオ設定
+            block_size (int): 合成に使うブロック長（サンプル数）
+        """
+        super().__init__(config)
+        self.ratios = np.asarray(ratios, dtype=np.float64).ravel()
+        num_partials = len(self.ratios)
+        
+        if amplitudes is None:
+            amplitudes = 1.0 / np.arange(1, num_partials + 1)
+        if decays is None:
+            decays = np.zeros(num_partials)
+        
+        self.amplitudes = np.broadcast_to(np.asarray(amplitudes, dtype=np.float64), (num_partials,)).copy()
+        self.decays = np.broadcast_to(np.asarray(decays, dtype=np.float64), (num_partials,)).copy()
+        self.block_size = block_size
+    
+    def generate(self, frequency, duration, phase=0.0):
+        """
+        部分音を合成した波形を生成
+        
+        ナイキスト周波数以上になる部分音は除外されます。
+        
+        Args:
+            frequency (float): 基本周波数 (Hz)
+            duration (float): 継続時間 (秒)
+            phase (float): 各部分音の初期位相 (0.0-1.0)
+            
+        Returns:
+            np.ndarray: 合成された波形データ
+        """
+        num_samples = self.config.duration_to_samples(duration)
+        sample_rate = self.config.sample_rate
+        
+        # ナイキスト周波数未満の部分音だけを使う
+        partial_frequencies = self.ratios * frequency
+        audible = partial_frequencies < sample_rate / 2
+        if num_samples == 0 or not np.any(audible):
+            return np.zeros(num_samples)
+        
+        # 部分音ごとの複素角周波数 (-d + iω) / fs
+        rate = (-self.decays[audible] + 2j * np.pi * partial_frequencies[audible]) / sample_rate
+        
+        block_size = min(self.block_size, num_samples)
+        num_blocks = -(-num_samples // block_size)
+        
+        # ブロック内の回転 (部分音, ブロック内位置) と各ブロック先頭の係数 (ブロック, 部分音)
+        block_basis = np.exp(np.outer(rate, np.arange(block_size)))
+        block_starts = np.arange(num_blocks) * block_size
+        initial = self.amplitudes[audible] * np.exp(2j * np.pi * phase)
+        coefficients = initial * np.exp(np.outer(block_starts, rate))
+        
+        # 行列積1回で全ブロックを合成し、虚部（正弦成分）を取り出す
+        signal = (coefficients @ block_basis).imag
+        return signal.ravel()[:num_samples]
+    
+    def generate_batch(self, frequencies, duration, phases=None, amplitudes=None):
+        """
+        複数の基本周波数の波形を一度に生成
+        
+        周波数ごとにナイキスト周波数未満の部分音が変わるため、
+        基本周波数ごとに generate() で合成して積み重ねます。
+        
+        Args:
+            frequencies (array-like): 基本周波数のリスト (Hz)
+            duration (float): 継続時間 (秒)
+            phases (array-like): 各基本周波数の部分音の初期位相 (0.0-1.0)。Noneの場合はすべて0
+            amplitudes (array-like): 各基本周波数の振幅。指定すると重み付きで合計した1本の信号を返す
+            
+        Returns:
+            np.ndarray: (周波数の数, サンプル数) の波形データ。
+                amplitudesを指定した場合は合計した (サンプル数,) の信号
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64).ravel()
+        if phases is None:
+            phases = np.zeros_like(frequencies)
+        else:
+            phases = np.broadcast_to(np.asarray(phases, dtype=np.float64).ravel(), frequencies.shape)
+        
+        num_samples = self.config.duration_to_samples(duration)
+        waves = np.zeros((len(frequencies), num_samples))
+        for i, (frequency, phase) in enumerate(zip(frequencies, phases)):
+            waves[i] = self.generate(frequency, duration, phase)
+        
+        if amplitudes is None:
+            return waves
+        return np.asarray(amplitudes, dtype=np.float64) @ waves
+
+class UnisonOscillator:
+    """
+    ユニゾン（スーパーソー）オシレーター
+    
+    任意のオシレーターを少しずつデチューンしたボイスを重ね、ステレオに広げます。
+    全ボイスを generate_batch() で1つの2次元配列として生成し、
+    左右のゲイン行列との行列積1回でステレオにミックスするため、
+    ボイス数が増えてもPythonのループは増えません。
+    """
+    
+    def __init__(self, oscillator=None, voices=7, detune_cents=20.0, stereo_spread=1.0, seed=None):
+        """
+        ユニゾンオシレーターを初期化
+        
+        Args:
+            oscillator (BaseOscillator): 重ねるオシレーター。Noneの場合は SawtoothWave。
+                generate_batch() で複数の周波数を生成できるものに限る
+            voices (int): ボイス数
+            detune_cents (float): 最も外側のボイスのデチューン量 (セント)。ボイスは ±detune_cents の範囲に等間隔に並ぶ
+            stereo_spread (float): ステレオの広がり (0.0: モノラル - 1.0: 左右いっぱい)
+            seed (int): 各ボイスの初期位相を決める乱数のシード
+        """
+        if voices < 1:
+            raise ValueError(f"ボイス数は1以上が必要です: {voices}")
+        
+        self.oscillator = oscillator or SawtoothWave()
+        
+        # _waveform() も generate_batch() も持たないオシレーター（ノイズなど）はボイスを作れない
+        oscillator_class = type(self.oscillator)
+        if (oscillator_class._waveform is BaseOscillator._waveform
+                and oscillator_class.generate_batch is BaseOscillator.generate_batch):
+            raise TypeError(f"ユニゾンに使えないオシレーター: {oscillator_class.__name__}")
+        
+        self.config = self.oscillator.config
+        self.voices = voices
+        self.detune_cents = detune_cents
+        self.stereo_spread = stereo_spread
+        self.rng = np.random.default_rng(seed)
+    
+    def _voice_positions(self):
+        """各ボイスの位置 (-1.0 から 1.0)"""
+        if self.voices == 1:
+            return np.zeros(1)
+        return np.linspace(-1.0, 1.0, self.voices)
+    
+    def _stereo_gains(self):
+        """各ボイスの左右のゲイン (2, ボイス数)。等パワーのパンニングで、全体を1/sqrt(ボイス数)に揃える"""
+        pan = self._voice_positions() * self.stereo_spread
+        angle = (pan + 1.0) * np.pi / 4
+        return np.vstack([np.cos(angle), np.sin(angle)]) * np.sqrt(2.0 / self.voices)
+    
+    def generate(self, frequency, duration):
+        """
+        ユニゾン波形を生成
+        
+        Args:
+            frequency (float): 中心の周波数 (Hz)
+            duration (float): 継続時間 (秒)
+            
+        Returns:
+            np.ndarray: (サンプル数, 2) のステレオ音声データ
+        """
+        frequencies = frequency * 2.0 ** (self._voice_positions() * self.detune_cents / 1200.0)
+        phases = self.rng.random(self.voices)
+        
+        waves = self.oscillator.generate_batch(frequencies, duration, phases=phases)
+        return (self._stereo_gains() @ waves).T
+
+# ピンクノイズ用の -3dB/oct 近似フィルター（4次のIIR）
+_PINK_NOISE_B = np.array([0.049922035, -0.095993537, 0.050612699, -0.004408786])
+_PINK_NOISE_A = np.array([1.0, -2.494956002, 2.017265875, -0.522189400])
+
+# ピンクノイズの立ち上がりの過渡応答として捨てるサンプル数
+_PINK_NOISE_WARMUP = 1430
+
+# ピンクノイズフィルターのインパルス応答のL2ノルム（出力の標準偏差 / 入力の標準偏差）
+_PINK_NOISE_GAIN = np.sqrt(np.sum(lfilter(_PINK_NOISE_B, _PINK_NOISE_A, np.eye(1, 1 << 16)[0]) ** 2))
+
+# 有色ノイズの標準偏差をamplitudeの何分の1にするか（RMS基準の校正値）
+# ピークは長い信号で標準偏差の4〜5倍程度になるため、amplitudeをわずかに超えることがある
+_NOISE_CREST_FACTOR = 4.0
+
 class NoiseGenerator(BaseOscillator):
-    """ノイズジェネレーター"""
+    """
+    ノイズジェネレーター
+    
+    インスタンスごとに独立した乱数生成器（numpy.random.Generator）を持ちます。
+    seedを指定すると出力が再現可能になります。並列処理では spawn() で
+    互いに独立した子ジェネレーターを作り、ワーカーごとに1つずつ使います。
+    
+    ピンク・ブラウンノイズはフィルターの状態をジェネレーターごとに保持し、
+    フィルターから決まる一定の係数で振幅を調整するため、
+    分割して生成しても一度に生成した場合と同じ信号になります。
+    この振幅はRMS（標準偏差）基準で、ピーク値は±amplitudeに収まるとは限りません。
+    クリッピングを避けたい場合は、後段でリミッターなどを使ってください。
+    """
+    
+    def __init__(self, config=None, seed=None):
+        """
+        ノイズジェネレーターを初期化
+        
+        Args:
+            config (AudioConfig): オーディオ設定
+            seed (int or np.random.SeedSequence): 乱数のシード。Noneの場合は毎回異なる出力
+        """
+        super().__init__(config)
+        self.reseed(seed)
+    
+    def reseed(self, seed=None):
+        """
+        乱数生成器をシードから作り直す
+        
+        Args:
+            seed (int or np.random.SeedSequence): 乱数のシード
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        
+        # 有色ノイズのフィルター状態（ピンクは最初の生成時に初期化、ブラウンは直前の出力）
+        self._pink_state = None
+        self._brown_state = 0.0
+    
+    def spawn(self, count):
+        """
+        互いに独立した乱数列を持つ子ジェネレーターを作成
+        
+        Args:
+            count (int): 作成する数
+            
+        Returns:
+            list: NoiseGenerator のリスト
+        """
+        return [NoiseGenerator(self.config, seed=child) for child in self.seed_sequence.spawn(count)]
     
     def generate_white_noise(self, duration, amplitude=1.0):
         """
@@ -146,29 +796,100 @@ class NoiseGenerator(BaseOscillator):
             np.ndarray: ホワイトノイズデータ
         """
         num_samples = self.config.duration_to_samples(duration)
-        return amplitude * (2.0 * np.random.random(num_samples) - 1.0)
+        return amplitude * (2.0 * self.rng.random(num_samples) - 1.0)
     
     def generate_pink_noise(self, duration, amplitude=1.0):
         """
-        ピンクノイズを生成（簡易版）
+        ピンクノイズ（-3dB/oct）を生成
+        
+        ホワイトノイズを4次のIIRフィルターに通して作ります。
+        フィルターの状態は呼び出し間で引き継がれます。
         
         Args:
             duration (float): 継続時間 (秒)
-            amplitude (float): 振幅
+            amplitude (float): RMS基準の振幅。標準偏差がamplitudeの1/4になるように調整する
+                （ピーク値ではないため、まれに±amplitudeを超える）
             
         Returns:
             np.ndarray: ピンクノイズデータ
         """
-        # 簡易的なピンクノイズ生成
-        white_noise = self.generate_white_noise(duration, amplitude)
+        num_samples = self.config.duration_to_samples(duration)
+        if num_samples == 0:
+            # 空の入力ではlfilterが不正な状態を返すため、状態を変えずに終える
+            return np.zeros(0)
+        
+        # 最初の呼び出しでは立ち上がりの過渡応答の分だけ余分に生成して捨てる
+        warmup = _PINK_NOISE_WARMUP if self._pink_state is None else 0
+        if self._pink_state is None:
+            self._pink_state = np.zeros(len(_PINK_NOISE_A) - 1)
+        white_noise = 2.0 * self.rng.random(num_samples + warmup) - 1.0
+        
+        pink_noise, self._pink_state = lfilter(_PINK_NOISE_B, _PINK_NOISE_A, white_noise, zi=self._pink_state)
+        return self._scale_colored_noise(pink_noise[warmup:], _PINK_NOISE_GAIN, amplitude)
+    
+    def generate_brown_noise(self, duration, amplitude=1.0, leak=0.995):
+        """
+        ブラウンノイズ（-6dB/oct）を生成
+        
+        ホワイトノイズをリーク付き積分器 y[n] = x[n] + leak * y[n-1] に通して作ります。
+        積分器の状態は呼び出し間で引き継がれます。
         
-        # ローパスフィルターでピンクノイズ的な特性を作る
-        # 実際のピンクノイズはより複雑な処理が必要
-        filtered = np.zeros_like(white_noise)
-        b0, b1, b2 = 0.99765, -1.99530, 0.99765
-        a1, a2 = -1.99530, 0.99530
+        Args:
+            duration (float): 継続時間 (秒)
+            amplitude (float): RMS基準の振幅。標準偏差がamplitudeの1/4になるように調整する
+                （ピーク値ではないため、まれに±amplitudeを超える）
+            leak (float): 積分器の係数 (0.0以上1.0未満)。1に近いほど低域が強くなる
+            
+        Returns:
+            np.ndarray: ブラウンノイズデータ
+        """
+        if not 0.0 <= leak < 1.0:
+            raise ValueError(f"leakは0.0以上1.0未満で指定してください: {leak}")
         
-        for i in range(2, len(white_noise)):
-            filtered[i] = b0 * white_noise[i] + b1 * white_noise[i-1] + b2 * white_noise[i-2] - a1 * filtered[i-1] - a2 * filtered[i-2]
+        num_samples = self.config.duration_to_samples(duration)
+        white_noise = 2.0 * self.rng.random(num_samples) - 1.0
         
-        return filtered
+        # 直前の出力を状態として保持するため、呼び出しごとにleakを変えても続きから積分できる
+        brown_noise, _ = lfilter([1.0], [1.0, -leak], white_noise, zi=[leak * self._brown_state])
+        if len(brown_noise) > 0:
+            self._brown_state = brown_noise[-1]
+        return self._scale_colored_noise(brown_noise, 1.0 / np.sqrt(1.0 - leak ** 2), amplitude)
+    
+    def generate_velvet_noise(self, duration, density=2000.0, amplitude=1.0):
+        """
+        ベルベットノイズを生成
+        
+        一定間隔の区間ごとにランダムな位置へ ±amplitude のインパルスを1つ置いた、
+        まばらなノイズです。リバーブやデコリレーションに使います。
+        
+        Args:
+            duration (float): 継続時間 (秒)
+            density (float): 1秒あたりのインパルス数
+            amplitude (float): インパルスの振幅
+            
+        Returns:
+            np.ndarray: ベルベットノイズデータ
+        """
+        num_samples = self.config.duration_to_samples(duration)
+        period = self.config.sample_rate / density
+        num_impulses = int(np.ceil(num_samples / period))
+        
+        # 各区間の先頭 + 区間内のランダムな位置
+        positions = (np.arange(num_impulses) * period + self.rng.random(num_impulses) * period).astype(np.int64)
+        signs = np.where(self.rng.random(num_impulses) < 0.5, -1.0, 1.0)
+        
+        valid = positions < num_samples
+        signal = np.zeros(num_samples)
+        signal[positions[valid]] = amplitude * signs[valid]
+        return signal
+    
+    def _scale_colored_noise(self, signal, filter_gain, amplitude):
+        """
+        フィルターのゲインから決まる一定の係数で振幅を調整
+        
+        一様分布のホワイトノイズ（標準偏差 1/√3）をL2ノルムがfilter_gainのフィルターに
+        通した信号の標準偏差が amplitude / _NOISE_CREST_FACTOR になるようにします。
+        信号ごとのピークで割らないため、長さや分割の仕方で音量が変わりません。
+        """
+        std = filter_gain / np.sqrt(3.0)
+        return signal * (amplitude / (_NOISE_CREST_FACTOR * std))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+ベンチマーク: エンベロープ生成速度の確認
+
+1音あたりのエンベロープ生成にかかる時間を、音の長さごとに計測します。
+生成そのものの速度を測るため、共有キャッシュは使わずに計測し、
+最後にキャッシュを使った場合の時間と比較します。
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from audio_lib import AudioConfig
+from audio_lib.synthesis.envelopes import ADSREnvelope, CosineEnvelope, EnvelopeCache
+
+def measure(func, repeat=20):
+    """関数の実行時間（最小値）を秒で返す"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def benchmark_envelope_note_lengths():
+    """音の長さを変えたときの1音あたりのエンベロープ生成時間"""
+    print("📈 エンベロープ: 音の長さと生成時間")
+
+    config = AudioConfig()
+    adsr = ADSREnvelope(attack=0.05, decay=0.2, sustain=0.6, release=0.3, config=config, cache=False)
+    cosine = CosineEnvelope(attack=0.05, release=0.3, config=config, cache=False)
+
+    print(f"   {'音の長さ (秒)':>12} | {'ADSR (µs)':>10} | {'コサイン (µs)':>12}")
+
+    for duration in [0.1, 0.25, 0.5, 1.0, 2.0, 4.0]:
+        adsr_time = measure(lambda: adsr.generate(duration))
+        cosine_time = measure(lambda: cosine.generate(duration))
+        print(f"   {duration:>12} | {adsr_time * 1e6:>10.1f} | {cosine_time * 1e6:>12.1f}")
+
+def benchmark_envelope_cache():
+    """キャッシュの有無による1音あたりのADSR生成時間の比較"""
+    print("\n🗃️ エンベロープ: キャッシュの有無")
+
+    config = AudioConfig()
+    uncached = ADSREnvelope(attack=0.05, decay=0.2, sustain=0.6, release=0.3, config=config, cache=False)
+    cached = ADSREnvelope(attack=0.05, decay=0.2, sustain=0.6, release=0.3, config=config,
+                          cache=EnvelopeCache())
+
+    print(f"   {'音の長さ (秒)':>12} | {'キャッシュなし (µs)':>18} | {'キャッシュあり (µs)':>18}")
+
+    for duration in [0.1, 0.5, 2.0]:
+        uncached_time = measure(lambda: uncached.generate(duration))
+        cached_time = measure(lambda: cached.generate(duration))
+        print(f"   {duration:>12} | {uncached_time * 1e6:>18.1f} | {cached_time * 1e6:>18.1f}")
+
+if __name__ == "__main__":
+    print("⏱️ エンベロープベンチマーク実行中...")
+    print("=" * 50)
+
+    benchmark_envelope_note_lengths()
+    benchmark_envelope_cache()
+
+    print("\n🎉 ベンチマーク完了！")
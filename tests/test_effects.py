@@ -0,0 +1,448 @@
+"""
+オーディオエフェクトのテスト
+
+ベクトル化したエフェクト処理が参照実装と一致すること、
+ブロック分割しても状態が正しく引き継がれることを検証します。
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+from scipy.signal import fftconvolve, freqz
+from audio_lib.core.audio_config import AudioConfig
+from audio_lib.core.wave_io import WaveFileIO
+from audio_lib.effects.audio_effects import (
+    Delay, Reverb, ConvolutionReverb, Compressor, Chorus, Distortion, apply_compression,
+    _get_oversampling_filter
+)
+
+
+def _test_signal(num_samples=20000, seed=0):
+    """テスト用のランダム信号"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-0.5, 0.5, num_samples)
+
+
+class TestDelay:
+    """ディレイのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal()
+
+    @pytest.mark.parametrize("delay_time", [0.0001, 0.01, 0.3, 1.0])
+    def test_vectorized_matches_reference(self, delay_time):
+        """遅延長より短い・長い入力で参照実装と一致するか"""
+        vectorized = Delay(delay_time, feedback=0.6, config=self.config).process(self.signal)
+        reference = Delay(delay_time, feedback=0.6, config=self.config).process(self.signal, mode='reference')
+
+        np.testing.assert_allclose(vectorized, reference, atol=1e-12)
+
+    def test_streaming_state(self):
+        """delay_buffer/delay_indexがブロック間で一貫しているか"""
+        whole_delay = Delay(0.01, feedback=0.5, config=self.config)
+        whole = whole_delay.process(self.signal, mode='reference')
+
+        delay = Delay(0.01, feedback=0.5, config=self.config)
+        boundaries = [0, 17, 17, 300, 441, 5000, 5100, len(self.signal)]
+        chunks = []
+        for i, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+            # 参照実装とベクトル化処理を交互に使う
+            mode = 'reference' if i % 2 else 'vectorized'
+            chunks.append(delay.process(self.signal[start:end], mode=mode))
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-12)
+
+        # 内部状態も同じ内容を指しているか（リングバッファの読み出し順で比較）
+        np.testing.assert_allclose(
+            np.roll(delay.delay_buffer, -delay.delay_index),
+            np.roll(whole_delay.delay_buffer, -whole_delay.delay_index),
+            atol=1e-12
+        )
+
+
+class TestReverb:
+    """リバーブのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal()
+
+    def test_comb_bank_matches_reference(self):
+        """クリッピングしない信号で参照実装と一致するか"""
+        quiet = 0.2 * self.signal
+        vectorized = Reverb(room_size=0.8, damping=0.7, config=self.config).process(quiet)
+        reference = Reverb(room_size=0.8, damping=0.7, config=self.config).process(quiet, mode='reference')
+
+        assert np.max(np.abs(reference)) <= 1.0
+        np.testing.assert_allclose(vectorized, reference, atol=1e-12)
+
+    def test_lookahead_latency_and_flush(self):
+        """先読み時は出力がlatencyだけ遅れ、flush()で残りを取り出せるか"""
+        quiet = 0.2 * self.signal
+        expected = Reverb(room_size=0.8, damping=0.7, config=self.config).process(quiet)
+
+        reverb = Reverb(room_size=0.8, damping=0.7, config=self.config, limiter_lookahead=0.005)
+        latency = reverb.latency
+        assert latency > 0
+        output = np.concatenate([reverb.process(quiet), reverb.flush()])
+
+        assert len(output) == len(quiet) + latency
+        np.testing.assert_allclose(output[:latency], 0.0)
+        np.testing.assert_allclose(output[latency:], expected, atol=1e-12)
+
+    def test_apply_in_blocks(self):
+        """apply()をブロックごとに呼んでも遅延や欠落がないか"""
+        quiet = 0.2 * self.signal
+        expected = Reverb(config=self.config).process(quiet)
+
+        reverb = Reverb(config=self.config, limiter_lookahead=0.005)
+        blocks = [reverb.apply(chunk) for chunk in np.array_split(quiet, 4)]
+
+        np.testing.assert_allclose(np.concatenate(blocks), expected, atol=1e-12)
+
+    @pytest.mark.parametrize("lookahead", [0.0, 0.005])
+    def test_streaming_matches_single_call(self, lookahead):
+        """ゲインステージを含めてブロック分割処理が一括処理と一致するか"""
+        loud = 4.0 * self.signal
+        whole = Reverb(room_size=0.9, damping=0.9, config=self.config,
+                       limiter_lookahead=lookahead).process(loud)
+
+        reverb = Reverb(room_size=0.9, damping=0.9, config=self.config, limiter_lookahead=lookahead)
+        chunks = [reverb.process(chunk) for chunk in np.array_split(loud, 7)]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-12)
+        assert np.max(np.abs(whole)) <= 1.0
+
+    def test_limiter_does_not_flatten_peaks(self):
+        """クレッシェンドする大音量の信号でも波形の頂点がつぶれないか"""
+        t = np.arange(self.config.sample_rate) / self.config.sample_rate
+        loud = np.linspace(1.0, 4.0, len(t)) * np.sin(2 * np.pi * 100 * t)
+        reverb = Reverb(wet_level=0.0, config=self.config, limiter_lookahead=0.005)
+        output = reverb.apply(loud)
+
+        assert np.max(np.abs(output)) <= 1.0
+        assert np.max(np.abs(output)) > 0.9
+        # 1.0に張り付いたサンプルがほとんどない
+        assert np.count_nonzero(np.abs(output) > 1.0 - 1e-6) < 10
+        # 隣り合うサンプルの間でゲインはなめらかに変化する
+        mask = np.abs(loud[:-1]) > 0.5
+        mask &= np.abs(loud[1:]) > 0.5
+        gain = output / np.where(np.abs(loud) > 0.5, loud, 1.0)
+        assert np.max(np.abs(np.diff(gain)[mask])) < 1e-3
+
+    def test_reset(self):
+        """リセット後は初期状態から処理されるか"""
+        loud = 4.0 * self.signal
+        reverb = Reverb(config=self.config)
+        first = reverb.process(loud)
+        reverb.reset()
+        np.testing.assert_allclose(reverb.process(loud), first)
+        assert reverb.limiter_gain_db < 0.0
+
+
+class TestConvolutionReverb:
+    """畳み込みリバーブのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal()
+        decay = np.exp(-np.arange(3000) / 600.0)
+        self.impulse_response = np.random.default_rng(1).normal(size=3000) * decay
+
+    def test_matches_direct_convolution(self):
+        """直接畳み込みの結果と一致するか"""
+        reverb = ConvolutionReverb(self.impulse_response, block_size=256, wet_level=1.0)
+        output = reverb.apply(self.signal)
+
+        expected = fftconvolve(self.signal, self.impulse_response)[:len(self.signal)]
+        np.testing.assert_allclose(output, expected, atol=1e-10)
+
+    def test_streaming_latency(self):
+        """任意長のブロックで処理でき、レイテンシが1ブロックか"""
+        block_size = 128
+        reverb = ConvolutionReverb(self.impulse_response, block_size=block_size, wet_level=0.5)
+        chunks = [reverb.process(chunk) for chunk in np.array_split(self.signal, 11)]
+        output = np.concatenate(chunks)
+
+        wet = fftconvolve(self.signal, self.impulse_response)[:len(self.signal)]
+        expected = 0.5 * self.signal + 0.5 * wet
+
+        assert len(output) == len(self.signal)
+        np.testing.assert_allclose(output[:block_size], 0.0)
+        np.testing.assert_allclose(output[block_size:], expected[:-block_size], atol=1e-10)
+
+    def test_stereo_impulse_response(self):
+        """モノラル入力にステレオのインパルス応答を適用できるか"""
+        stereo_ir = np.column_stack([self.impulse_response, 0.5 * self.impulse_response[::-1]])
+        output = ConvolutionReverb(stereo_ir, block_size=512, wet_level=1.0).apply(self.signal)
+
+        assert output.shape == (len(self.signal), 2)
+        expected = fftconvolve(self.signal, stereo_ir[:, 1])[:len(self.signal)]
+        np.testing.assert_allclose(output[:, 1], expected, atol=1e-10)
+
+    def test_spectrum_cache_is_shared(self):
+        """同じインパルス応答のスペクトルが共有されるか"""
+        ConvolutionReverb.clear_cache()
+        first = ConvolutionReverb(self.impulse_response, block_size=256)
+        second = ConvolutionReverb(self.impulse_response.copy(), block_size=256)
+
+        assert first.ir_spectra is second.ir_spectra
+        assert len(ConvolutionReverb._spectrum_cache) == 1
+
+    def test_spectrum_cache_is_bounded(self):
+        """キャッシュが上限を超えて大きくならないか"""
+        ConvolutionReverb.clear_cache()
+        for block_size in range(16, 16 + 2 * ConvolutionReverb._spectrum_cache_size):
+            ConvolutionReverb(self.impulse_response, block_size=block_size)
+
+        assert len(ConvolutionReverb._spectrum_cache) == ConvolutionReverb._spectrum_cache_size
+        ConvolutionReverb.clear_cache()
+
+    def test_empty_block(self):
+        """空のブロックを渡しても状態を変えずに空の出力を返すか"""
+        whole = ConvolutionReverb(self.impulse_response, block_size=256).process(self.signal)
+
+        reverb = ConvolutionReverb(self.impulse_response, block_size=256)
+        assert reverb.process(np.zeros(0)).shape == (0,)
+        assert reverb.process(np.zeros((0, 2))).shape == (0, 2)
+        first = reverb.process(self.signal[:1000])
+        assert reverb.process(self.signal[:0]).shape == (0,)
+        second = reverb.process(self.signal[1000:])
+
+        np.testing.assert_allclose(np.concatenate([first, second]), whole, atol=1e-10)
+
+    def test_from_file(self):
+        """WAVファイルからインパルス応答を読み込めるか"""
+        impulse_response = 0.5 * self.impulse_response / np.max(np.abs(self.impulse_response))
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
+            temp_filename = tmp_file.name
+
+        try:
+            WaveFileIO.save_mono(temp_filename, 22050, impulse_response)
+            reverb = ConvolutionReverb.from_file(temp_filename, config=self.config)
+        finally:
+            os.unlink(temp_filename)
+
+        # 22050Hz -> 44100Hz にリサンプリングされる
+        assert len(reverb.impulse_response) == 2 * len(impulse_response)
+        assert reverb.process(self.signal[:1000]).shape == (1000,)
+
+
+class TestCompressor:
+    """コンプレッサーのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        t = np.arange(self.config.sample_rate) / self.config.sample_rate
+        # 前半は閾値以下、後半は閾値を超える正弦波
+        levels = np.where(t < 0.5, 0.3, 1.0)
+        self.signal = levels * np.sin(2 * np.pi * 440 * t)
+
+    def _follow_per_sample(self, signal, threshold, ratio, attack=0.01, release=0.1):
+        """アタック/リリースを1サンプルずつ切り替える従来のコンプレッサー"""
+        attack_coeff = np.exp(-1.0 / (attack * self.config.sample_rate))
+        release_coeff = np.exp(-1.0 / (release * self.config.sample_rate))
+        envelope = 0.0
+        output = np.zeros_like(signal)
+        for n, x_n in enumerate(signal):
+            coeff = attack_coeff if abs(x_n) > envelope else release_coeff
+            envelope += (abs(x_n) - envelope) * (1 - coeff)
+            gain = 1.0 - ((envelope - threshold) / ratio) / envelope if envelope > threshold else 1.0
+            output[n] = x_n * gain
+        return output
+
+    def test_default_matches_per_sample_follower(self):
+        """既定の処理が従来のエンベロープフォロワーと一致するか"""
+        output = apply_compression(self.signal, threshold=0.5, ratio=4.0)
+        expected = self._follow_per_sample(self.signal, threshold=0.5, ratio=4.0)
+
+        np.testing.assert_allclose(output, expected, atol=1e-12)
+
+    def test_vectorized_detector(self):
+        """分離型ピーク検出器でも閾値以下は変化せず、閾値を超えると圧縮されるか"""
+        vectorized = apply_compression(self.signal, threshold=0.5, ratio=4.0, mode='vectorized')
+
+        np.testing.assert_allclose(vectorized[:20000], self.signal[:20000])
+        assert np.max(np.abs(vectorized[-4000:])) < 0.95
+
+    @pytest.mark.parametrize("mode", ['reference', 'vectorized'])
+    def test_chunked_processing(self, mode):
+        """エンベロープの状態がブロック間で保持されるか"""
+        whole = Compressor(threshold=0.5, lookahead=0.005).process(self.signal, mode=mode)
+
+        compressor = Compressor(threshold=0.5, lookahead=0.005)
+        chunks = [compressor.process(chunk, mode=mode) for chunk in np.array_split(self.signal, 9)]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-12)
+
+    def test_modes_share_peak_state(self):
+        """参照実装もピークホールドの状態を進め、途中で処理方式を切り替えられるか"""
+        reference = Compressor(threshold=0.5)
+        reference.process(self.signal[:30000], mode='reference')
+        vectorized = Compressor(threshold=0.5)
+        vectorized.process(self.signal[:30000], mode='vectorized')
+
+        assert reference.peak > 0.9
+        assert reference.peak == pytest.approx(vectorized.peak, rel=1e-9)
+
+    def test_sidechain(self):
+        """サイドチェーン信号で検出器を駆動できるか"""
+        pad = 0.4 * np.ones(4410)
+        kick = np.zeros(4410)
+        kick[1000:1500] = 1.0
+
+        ducked = apply_compression(pad, threshold=0.2, ratio=10.0, attack=0.001, sidechain=kick)
+
+        np.testing.assert_allclose(ducked[:1000], pad[:1000])
+        assert np.min(ducked[1000:2000]) < 0.95 * 0.4
+
+    def test_lookahead(self):
+        """先読み時に音声が遅延し、ゲインリダクションが先に始まるか"""
+        burst = np.zeros(4410)
+        burst[2000:] = 1.0
+        lookahead = 0.002
+        delay_samples = self.config.duration_to_samples(lookahead)
+
+        output = Compressor(threshold=0.5, attack=0.0005, lookahead=lookahead).process(burst)
+
+        np.testing.assert_allclose(output[:2000 + delay_samples], 0.0)
+        # 遅延した音声が届いた時点ですでに圧縮されている
+        assert output[2000 + delay_samples] < 1.0
+
+    def test_sidechain_length_mismatch(self):
+        """長さの異なるサイドチェーンはエラーになるか"""
+        with pytest.raises(ValueError):
+            Compressor().process(self.signal, sidechain=self.signal[:100])
+
+
+class TestChorus:
+    """コーラスのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal(8000)
+
+    def test_fractional_delay_interpolation(self):
+        """分数遅延が線形補間で読み出されるか"""
+        chorus = Chorus(rate=3.0, depth=0.003, wet_level=1.0, config=self.config)
+        output = chorus.process(self.signal)
+
+        n = np.arange(len(self.signal))
+        lfo = np.sin(2 * np.pi * n * 3.0 / self.config.sample_rate)
+        delay_samples = 0.003 * (1 + lfo) * self.config.sample_rate
+        # 入力前の無音を補間に含めるため先頭をゼロで埋める
+        padding = 300
+        padded = np.concatenate((np.zeros(padding), self.signal))
+        expected = np.interp(n + padding - delay_samples, np.arange(len(padded)), padded)
+
+        np.testing.assert_allclose(output, expected, atol=1e-10)
+
+    def test_chunked_processing(self):
+        """フェーズとバッファ位置がブロック間で引き継がれるか"""
+        whole = Chorus(rate=1.5, depth=0.005, voices=3, config=self.config).process(self.signal)
+
+        chorus = Chorus(rate=1.5, depth=0.005, voices=3, config=self.config)
+        chunks = [chorus.process(chunk) for chunk in np.array_split(self.signal, 13)]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-10)
+
+    def test_voices_spread_phases(self):
+        """複数声部がLFO位相をずらした単声部の平均になるか"""
+        voices = 4
+        output = Chorus(rate=2.0, depth=0.002, wet_level=1.0, voices=voices).process(self.signal)
+
+        singles = []
+        for v in range(voices):
+            chorus = Chorus(rate=2.0, depth=0.002, wet_level=1.0)
+            chorus.phase = v / voices
+            singles.append(chorus.process(self.signal))
+
+        np.testing.assert_allclose(output, np.mean(singles, axis=0), atol=1e-10)
+
+    def test_positional_config(self):
+        """従来どおり4番目の位置引数でconfigを渡せるか"""
+        chorus = Chorus(2.0, 0.002, 0.5, self.config)
+
+        assert chorus.config is self.config
+        assert chorus.voices == 1
+
+
+class TestDistortionOversampling:
+    """ディストーションのオーバーサンプリングのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.frequency = 3001
+        n = np.arange(self.config.sample_rate)
+        self.signal = 0.8 * np.sin(2 * np.pi * self.frequency * n / self.config.sample_rate)
+
+    def _alias_ratio(self, output):
+        """倍音以外の周波数に含まれるエネルギーの割合（1秒の信号を想定）"""
+        spectrum = np.abs(np.fft.rfft(output * np.hanning(len(output)))) ** 2
+        mask = np.ones(len(spectrum), dtype=bool)
+        for harmonic in range(self.frequency, self.config.sample_rate // 2, self.frequency):
+            mask[harmonic - 20:harmonic + 21] = False
+        return np.sum(spectrum[mask]) / np.sum(spectrum)
+
+    def test_oversampling_reduces_aliasing(self):
+        """オーバーサンプリングでエイリアシングが減るか"""
+        base = Distortion(gain=20.0, oversampling=1).process(self.signal)
+        oversampled = Distortion(gain=20.0, oversampling=4).process(self.signal)
+
+        assert len(oversampled) == len(self.signal)
+        assert self._alias_ratio(oversampled) < self._alias_ratio(base) / 100
+
+    @pytest.mark.parametrize("factor", [2, 8])
+    def test_streaming_state(self, factor):
+        """リサンプラーの状態がブロック間で引き継がれるか"""
+        whole = Distortion(gain=10.0, oversampling=factor).process(self.signal)
+
+        distortion = Distortion(gain=10.0, oversampling=factor)
+        chunks = [distortion.process(chunk) for chunk in np.array_split(self.signal, 9)]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-12)
+
+    def test_stereo_matches_mono(self):
+        """ステレオ入力の各チャンネルがモノラル処理と一致するか"""
+        stereo = np.column_stack([self.signal, 0.5 * self.signal[::-1]])
+        distortion = Distortion(gain=10.0, oversampling=4)
+        chunks = [distortion.process(chunk) for chunk in np.array_split(stereo, 5)]
+        output = np.concatenate(chunks)
+
+        assert output.shape == stereo.shape
+        for ch in range(2):
+            mono = Distortion(gain=10.0, oversampling=4).process(stereo[:, ch])
+            np.testing.assert_allclose(output[:, ch], mono, atol=1e-12)
+
+    def test_positional_config(self):
+        """従来どおり3番目の位置引数でconfigを渡せるか"""
+        distortion = Distortion(10.0, 0.5, self.config)
+
+        assert distortion.config is self.config
+        assert distortion.oversampling == 1
+
+    def test_filter_response(self):
+        """可聴帯域を平坦に通し、元のナイキスト周波数より上を十分に減衰させるか"""
+        for factor in (2, 4, 8):
+            fir = _get_oversampling_filter(factor)
+            nyquist = np.array([0.9, 1.1, 1.5]) * np.pi / factor
+            _, response = freqz(fir, worN=nyquist)
+            gain_db = 20 * np.log10(np.abs(response))
+
+            assert abs(gain_db[0]) < 0.01
+            assert np.all(gain_db[1:] < -80.0)
+
+    @pytest.mark.parametrize("factor", [3, 0, -2, 2.0, True])
+    def test_invalid_factor(self, factor):
+        """未対応の倍率や整数以外はエラーになるか"""
+        with pytest.raises(ValueError):
+            Distortion(oversampling=factor)
@@ -0,0 +1,420 @@
+"""
+エンベロープのテスト
+
+ベクトル化したエンベロープ生成が、1サンプルずつ計算するループ版と
+ビット単位で一致することを検証します。
+"""
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from audio_lib.core.audio_config import AudioConfig
+from audio_lib.synthesis.envelopes import (
+    ADSREnvelope, CosineEnvelope, LinearEnvelope, EnvelopeCache,
+    EnvelopeSegment, SegmentEnvelope, BreakpointEnvelope, apply_envelope
+)
+
+
+def _adsr_reference(envelope, duration, gate_time=None):
+    """1サンプルずつループで計算するADSRの参照実装"""
+    config = envelope.config
+    if gate_time is None:
+        gate_time = max(0, duration - envelope.release)
+    
+    num_samples = config.duration_to_samples(duration)
+    output = np.zeros(num_samples)
+    attack_samples = config.duration_to_samples(envelope.attack)
+    decay_samples = config.duration_to_samples(envelope.decay)
+    gate_samples = config.duration_to_samples(gate_time)
+    release_samples = config.duration_to_samples(envelope.release)
+    
+    attack_end = min(attack_samples, num_samples)
+    if attack_samples > 0:
+        for n in range(attack_end):
+            output[n] = (1 - np.exp(-5 * n / attack_samples)) / (1 - np.exp(-5))
+    
+    decay_start = attack_end
+    decay_end = min(decay_start + decay_samples, gate_samples, num_samples)
+    if decay_samples > 0 and decay_end > decay_start:
+        for n in range(decay_start, decay_end):
+            progress = (n - decay_start) / decay_samples
+            output[n] = 1.0 + (envelope.sustain - 1.0) * (1 - np.exp(-5 * progress))
+    
+    sustain_end = min(gate_samples, num_samples)
+    if sustain_end > decay_end:
+        output[decay_end:sustain_end] = envelope.sustain
+    
+    release_start = min(gate_samples, num_samples)
+    release_end = min(release_start + release_samples, num_samples)
+    if release_samples > 0 and release_end > release_start:
+        initial_level = envelope.sustain
+        for n in range(release_start, release_end):
+            progress = (n - release_start) / release_samples
+            output[n] = initial_level * np.exp(-5 * progress)
+    
+    return output
+
+
+def _cosine_reference(envelope, duration, sustain_level=1.0):
+    """1サンプルずつループで計算するコサインエンベロープの参照実装"""
+    config = envelope.config
+    num_samples = config.duration_to_samples(duration)
+    output = np.ones(num_samples) * sustain_level
+    attack_samples = config.duration_to_samples(envelope.attack)
+    release_samples = config.duration_to_samples(envelope.release)
+    
+    if attack_samples > 0:
+        for n in range(min(attack_samples, num_samples)):
+            progress = n / attack_samples
+            output[n] = sustain_level * (0.5 - 0.5 * np.cos(np.pi * progress))
+    
+    release_start = max(0, num_samples - release_samples)
+    if release_samples > 0 and release_start < num_samples:
+        for n in range(release_start, num_samples):
+            progress = (n - release_start) / release_samples
+            output[n] = sustain_level * (0.5 + 0.5 * np.cos(np.pi * progress))
+    
+    return output
+
+
+class TestVectorizedEnvelopes:
+    """ベクトル化したエンベロープ生成のテスト"""
+    
+    @pytest.mark.parametrize("attack,decay,sustain,release", list(itertools.product(
+        [0.0, 0.01, 0.1], [0.0, 0.05, 0.3], [0.0, 0.6], [0.0, 0.1, 0.5]
+    )))
+    def test_adsr_matches_reference(self, attack, decay, sustain, release):
+        """ADSRがループ版とビット単位で一致するか（ゲートが各段階の途中で切れる場合を含む）"""
+        config = AudioConfig(sample_rate=8000)
+        envelope = ADSREnvelope(attack, decay, sustain, release, config)
+        
+        for duration, gate_time in [(0.05, None), (0.6, None), (0.6, 0.02), (0.6, 0.2), (1.2, 0.8)]:
+            np.testing.assert_array_equal(
+                envelope.generate(duration, gate_time),
+                _adsr_reference(envelope, duration, gate_time)
+            )
+    
+    @pytest.mark.parametrize("attack,release", list(itertools.product([0.0, 0.01, 0.3], [0.0, 0.05, 0.4])))
+    def test_cosine_matches_reference(self, attack, release):
+        """コサインエンベロープがループ版とビット単位で一致するか"""
+        config = AudioConfig(sample_rate=8000)
+        envelope = CosineEnvelope(attack, release, config)
+        
+        for duration, sustain_level in [(0.05, 1.0), (0.5, 0.7), (1.0, 1.0)]:
+            np.testing.assert_array_equal(
+                envelope.generate(duration, sustain_level),
+                _cosine_reference(envelope, duration, sustain_level)
+            )
+
+
+class TestEnvelopeCache:
+    """エンベロープのキャッシュのテスト"""
+    
+    def test_identical_notes_hit_cache(self):
+        """同じ条件のエンベロープがキャッシュから返るか"""
+        cache = EnvelopeCache()
+        envelope = ADSREnvelope(0.01, 0.1, 0.5, 0.2, cache=cache)
+        
+        first = envelope.generate(0.5)
+        second = ADSREnvelope(0.01, 0.1, 0.5, 0.2, cache=cache).generate(0.5)
+        
+        assert second is first
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        
+        # 長さやゲートが違えば別のエンベロープ
+        envelope.generate(0.5, gate_time=0.1)
+        envelope.generate(0.6)
+        assert cache.stats()['misses'] == 3
+    
+    def test_cached_arrays_are_read_only(self):
+        """キャッシュされた配列が書き換えできないか"""
+        envelope = CosineEnvelope(0.01, 0.01, cache=EnvelopeCache())
+        with pytest.raises(ValueError):
+            envelope.generate(0.1)[0] = 1.0
+    
+    def test_cached_matches_uncached(self):
+        """キャッシュの有無で結果が変わらないか"""
+        cache = EnvelopeCache()
+        for cls, args in [(ADSREnvelope, (0.01, 0.1, 0.5, 0.2)), (LinearEnvelope, (0.02, 0.05)),
+                          (CosineEnvelope, (0.02, 0.05))]:
+            np.testing.assert_array_equal(
+                cls(*args, cache=cache).generate(0.3),
+                cls(*args, cache=False).generate(0.3)
+            )
+    
+    def test_sample_rate_is_part_of_key(self):
+        """サンプリング周波数が違えば別のエンベロープになるか"""
+        cache = EnvelopeCache()
+        a = LinearEnvelope(0.01, 0.01, AudioConfig(sample_rate=8000), cache=cache).generate(0.1)
+        b = LinearEnvelope(0.01, 0.01, AudioConfig(sample_rate=16000), cache=cache).generate(0.1)
+        assert len(a) == 800 and len(b) == 1600
+    
+    def test_lru_eviction(self):
+        """上限を超えると最も古いものから削除されるか"""
+        config = AudioConfig(sample_rate=1000)
+        # 100サンプル (800バイト) のエンベロープを3つまで
+        cache = EnvelopeCache(max_bytes=2400)
+        envelope = LinearEnvelope(0.01, 0.01, config, cache=cache)
+        
+        envelope.generate(0.1)
+        envelope.generate(0.1 + 1e-9)
+        envelope.generate(0.1 + 2e-9)
+        envelope.generate(0.1)          # 最初のものを最近使ったことにする
+        envelope.generate(0.1 + 3e-9)   # 2番目が削除される
+        
+        stats = cache.stats()
+        assert stats['entries'] == 3
+        assert stats['evictions'] == 1
+        assert stats['bytes'] <= 2400
+        
+        envelope.generate(0.1)
+        assert cache.stats()['hits'] == 2
+        envelope.generate(0.1 + 1e-9)
+        assert cache.stats()['misses'] == 5
+    
+    def test_oversized_envelope_not_cached(self):
+        """上限より大きいエンベロープはキャッシュされないか"""
+        cache = EnvelopeCache(max_bytes=100)
+        LinearEnvelope(cache=cache).generate(0.1)
+        assert len(cache) == 0
+    
+    def test_shared_between_threads(self):
+        """複数のスレッドから使っても統計と登録数が壊れないか"""
+        cache = EnvelopeCache()
+        envelopes = [ADSREnvelope(0.01, 0.1, 0.5, 0.2, cache=cache) for _ in range(4)]
+        durations = [0.1, 0.2, 0.3] * 50
+        
+        def worker(envelope):
+            return [envelope.generate(duration) for duration in durations]
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(worker, envelopes))
+        
+        stats = cache.stats()
+        assert stats['hits'] + stats['misses'] == 4 * len(durations)
+        assert stats['entries'] == 3
+        for result in results[1:]:
+            for a, b in zip(result, results[0]):
+                np.testing.assert_array_equal(a, b)
+
+
+def _stream(envelope, gate_samples, total_samples, block_size):
+    """note_on → ゲート時間だけ生成 → note_off → 残りを生成"""
+    envelope.note_on()
+    blocks = []
+    done = 0
+    while done < total_samples:
+        if done == gate_samples:
+            envelope.note_off()
+        end = gate_samples if done < gate_samples else total_samples
+        count = min(block_size, end - done)
+        blocks.append(envelope.process_block(count))
+        done += count
+    return np.concatenate(blocks)
+
+
+class TestStreamingADSR:
+    """ストリーミングADSRのテスト"""
+    
+    @pytest.mark.parametrize("block_size", [1, 64, 333, 4096])
+    @pytest.mark.parametrize("attack,decay,sustain,release", [
+        (0.01, 0.1, 0.5, 0.2), (0.0, 0.05, 0.7, 0.1), (0.02, 0.0, 0.6, 0.3),
+    ])
+    def test_matches_generate_when_released_in_sustain(self, block_size, attack, decay, sustain, release):
+        """サステイン中にnote_offした場合、generate() とビット単位で一致するか"""
+        envelope = ADSREnvelope(attack, decay, sustain, release, cache=False)
+        expected = envelope.generate(0.8, gate_time=0.5)
+        
+        gate_samples = envelope.config.duration_to_samples(0.5)
+        signal = _stream(envelope, gate_samples, len(expected), block_size)
+        
+        np.testing.assert_array_equal(signal, expected)
+        assert not envelope.is_active
+    
+    def test_release_starts_from_current_level(self):
+        """アタック中にnote_offするとその時点のレベルからリリースするか"""
+        envelope = ADSREnvelope(0.1, 0.1, 0.5, 0.1, cache=False)
+        envelope.note_on()
+        attack = envelope.process_block(1000)
+        envelope.note_off()
+        release = envelope.process_block(100)
+        
+        assert 0.0 < attack[-1] < 1.0
+        assert release[0] == attack[-1]
+        assert np.all(np.diff(release) < 0)
+    
+    def test_retrigger_starts_from_current_level(self):
+        """リリース中に再トリガーすると現在のレベルからアタックするか"""
+        envelope = ADSREnvelope(0.01, 0.05, 0.6, 0.2, cache=False)
+        envelope.note_on()
+        envelope.process_block(5000)
+        envelope.note_off()
+        release = envelope.process_block(1000)
+        envelope.note_on()
+        attack = envelope.process_block(441)
+        
+        assert 0.0 < release[-1] < 0.6
+        assert attack[0] == release[-1]
+        assert np.all(np.diff(attack) > 0)
+        assert attack[-1] == pytest.approx(1.0, abs=0.01)
+    
+    def test_idle_until_note_on(self):
+        """note_onの前とリリース後は無音か"""
+        envelope = ADSREnvelope(0.01, 0.01, 0.5, 0.01, cache=False)
+        assert np.all(envelope.process_block(100) == 0.0)
+        
+        envelope.note_on()
+        envelope.process_block(2000)
+        envelope.note_off()
+        envelope.process_block(2000)
+        assert not envelope.is_active
+        assert np.all(envelope.process_block(100) == 0.0)
+    
+    def test_sustain_holds_indefinitely(self):
+        """ゲートが開いている間はサステインレベルを保つか"""
+        envelope = ADSREnvelope(0.01, 0.05, 0.4, 0.1, cache=False)
+        envelope.note_on()
+        envelope.process_block(5000)
+        assert np.all(envelope.process_block(44100) == 0.4)
+
+
+class TestSegmentEnvelope:
+    """セグメント形式のエンベロープのテスト"""
+    
+    @pytest.mark.parametrize("gate_time", [None, 0.05, 0.3, 2.0])
+    @pytest.mark.parametrize("attack,decay,sustain,release", [
+        (0.01, 0.1, 0.5, 0.2), (0.0, 0.05, 0.7, 0.1), (0.02, 0.0, 0.6, 0.3), (0.01, 0.1, 0.0, 0.0),
+    ])
+    def test_adsr_to_segments_matches_generate(self, attack, decay, sustain, release, gate_time):
+        """ADSRのセグメント形式を信号に掛けた結果が generate() と一致するか"""
+        envelope = ADSREnvelope(attack, decay, sustain, release, cache=False)
+        signal = np.random.default_rng(0).uniform(-1.0, 1.0, envelope.config.duration_to_samples(0.6))
+        
+        expected = apply_envelope(signal, envelope.generate(0.5, gate_time))
+        result = envelope.to_segments(0.5, gate_time).apply(signal)
+        
+        np.testing.assert_allclose(result, expected, atol=1e-12)
+    
+    def test_sustain_is_single_constant_segment(self):
+        """長い音のサステインが定数のセグメント1つになるか"""
+        segments = ADSREnvelope(0.01, 0.1, 0.5, 0.2).to_segments(60.0).segments
+        constant = [segment for segment in segments if segment.curve == 'constant']
+        
+        assert len(segments) == 4
+        assert len(constant) == 1
+        assert constant[0].length > 50 * 44100
+    
+    @pytest.mark.parametrize("curve", ['linear', 'exponential', 'cosine'])
+    def test_curve_endpoints(self, curve):
+        """各カーブが始点のレベルから始まり、終点のレベルへ向かうか"""
+        segment = EnvelopeSegment(0, 1000, curve, 0.2, 0.8)
+        values = segment.values()
+        
+        assert values[0] == pytest.approx(0.2)
+        assert values[-1] == pytest.approx(0.8, abs=0.01)
+        assert np.all(np.diff(values) >= 0)
+    
+    def test_gaps_are_silent_and_gain_applied(self):
+        """セグメントのない区間が0になり、ゲインが掛かるか"""
+        envelope = SegmentEnvelope([
+            EnvelopeSegment(0, 10, 'constant', 0.5),
+            EnvelopeSegment(20, 10, 'linear', 0.0, 1.0),
+        ], num_samples=40)
+        
+        result = envelope.apply(np.ones(50), gain=2.0)
+        
+        assert len(result) == 40
+        np.testing.assert_allclose(result[:10], 1.0)
+        np.testing.assert_array_equal(result[10:20], 0.0)
+        np.testing.assert_allclose(result[20:30], 2.0 * np.arange(10) / 10)
+        np.testing.assert_array_equal(result[30:], 0.0)
+    
+    def test_apply_in_place(self):
+        """out に入力信号自身を渡すと上書きされるか"""
+        signal = np.ones(100)
+        envelope = SegmentEnvelope([EnvelopeSegment(0, 100, 'linear', 1.0, 0.0)])
+        result = envelope.apply(signal, out=signal)
+        
+        assert np.shares_memory(result, signal)
+        np.testing.assert_allclose(signal, 1.0 - np.arange(100) / 100)
+    
+    def test_overlapping_segments_rejected(self):
+        """重なったセグメントがエラーになるか"""
+        with pytest.raises(ValueError):
+            SegmentEnvelope([EnvelopeSegment(0, 10), EnvelopeSegment(5, 10)])
+    
+    def test_unknown_curve_rejected(self):
+        """未知のカーブがエラーになるか"""
+        with pytest.raises(ValueError):
+            EnvelopeSegment(0, 10, 'square')
+
+
+class TestBreakpointEnvelope:
+    """折れ点エンベロープのテスト"""
+    
+    def test_linear_breakpoints_match_interp(self):
+        """直線で結んだ折れ点が np.interp と一致するか"""
+        config = AudioConfig(sample_rate=1000)
+        points = [(0.0, 0.0), (0.1, 1.0), (0.3, 0.4), (0.5, 0.4), (0.8, 0.0)]
+        envelope = BreakpointEnvelope(points, config=config)
+        
+        t = np.arange(800) / 1000
+        expected = np.interp(t, [p[0] for p in points], [p[1] for p in points])
+        np.testing.assert_allclose(envelope.generate(), expected, atol=1e-12)
+        
+        # 同じレベルの区間は定数のセグメントになる
+        assert envelope.segments[2].is_constant
+    
+    def test_per_segment_curves(self):
+        """区間ごとにカーブを指定できるか"""
+        envelope = BreakpointEnvelope([(0.0, 0.0), (0.1, 1.0), (0.2, 0.0)], curve=['exponential', 'cosine'])
+        assert [segment.curve for segment in envelope.segments] == ['exponential', 'cosine']
+        
+        with pytest.raises(ValueError):
+            BreakpointEnvelope([(0.0, 0.0), (0.1, 1.0)], curve=['linear', 'linear'])
+    
+    def test_unsorted_points_rejected(self):
+        """時刻の順に並んでいない折れ点がエラーになるか"""
+        with pytest.raises(ValueError):
+            BreakpointEnvelope([(0.2, 0.0), (0.1, 1.0)])
+
+
+class TestApplyEnvelope:
+    """apply_envelope() のテスト"""
+    
+    def test_gain_matches_separate_scaling(self):
+        """ゲイン付きの結果がゲインを先に掛けた場合とビット単位で一致するか"""
+        rng = np.random.default_rng(0)
+        signal = rng.uniform(-1.0, 1.0, 1000)
+        envelope = ADSREnvelope(0.01, 0.01, 0.5, 0.005).generate(1000 / 44100)
+        
+        expected = (signal * 0.7) * envelope
+        np.testing.assert_array_equal(apply_envelope(signal, envelope, gain=0.7), expected)
+        np.testing.assert_array_equal(apply_envelope(signal, envelope), signal * envelope)
+    
+    def test_in_place(self):
+        """out に入力信号を渡すとその場で書き換えるか"""
+        signal = np.ones(100)
+        result = apply_envelope(signal, np.linspace(0.0, 1.0, 100), gain=2.0, out=signal)
+        
+        assert np.shares_memory(result, signal)
+        np.testing.assert_allclose(signal, np.linspace(0.0, 2.0, 100))
+    
+    def test_length_is_shorter_of_two(self):
+        """信号とエンベロープの短い方の長さになるか"""
+        assert len(apply_envelope(np.ones(100), np.ones(60))) == 60
+        assert len(apply_envelope(np.ones(40), np.ones(60), out=np.empty(40))) == 40
+    
+    def test_segment_envelope_delegated(self):
+        """SegmentEnvelope を渡すとセグメントごとに適用されるか"""
+        adsr = ADSREnvelope(0.01, 0.05, 0.6, 0.05, cache=False)
+        signal = np.random.default_rng(1).uniform(-1.0, 1.0, 8820)
+        
+        np.testing.assert_allclose(
+            apply_envelope(signal, adsr.to_segments(0.2), gain=0.5),
+            apply_envelope(signal, adsr.generate(0.2), gain=0.5),
+            atol=1e-12
+        )
@@ -0,0 +1,203 @@
+"""
+フィルターのテスト
+
+ベクトル化したフィルター処理が参照実装（1サンプルずつのループ）と
+一致すること、ブロック分割しても状態が正しく引き継がれることを検証します。
+"""
+
+import numpy as np
+import pytest
+from audio_lib.core.audio_config import AudioConfig
+from audio_lib.effects.filters import (
+    LowPassFilter, HighPassFilter, BandPassFilter, FilterChain, SimpleMovingAverageFilter
+)
+
+
+def _test_signal(num_samples=4096, seed=0):
+    """テスト用のランダム信号"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1.0, 1.0, num_samples)
+
+
+class TestBiquadFilter:
+    """バイクアッドフィルターのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal()
+
+    @pytest.mark.parametrize("filter_class, freq", [
+        (LowPassFilter, 1000),
+        (HighPassFilter, 500),
+        (BandPassFilter, 2000),
+    ])
+    def test_vectorized_matches_reference(self, filter_class, freq):
+        """ベクトル化処理が参照実装と一致するか"""
+        vectorized = filter_class(freq, config=self.config).process(self.signal)
+        reference = filter_class(freq, config=self.config).process(self.signal, mode='reference')
+
+        np.testing.assert_allclose(vectorized, reference, atol=1e-10)
+
+    def test_chunked_processing_matches_single_call(self):
+        """ブロック分割処理が一括処理と一致するか"""
+        whole = LowPassFilter(800, config=self.config).process(self.signal)
+
+        lpf = LowPassFilter(800, config=self.config)
+        # 1サンプルや空のブロックも含めて分割
+        boundaries = [0, 1, 1, 7, 500, 2048, len(self.signal)]
+        chunks = [lpf.process(self.signal[start:end])
+                  for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-10)
+
+    def test_modes_share_state(self):
+        """参照実装とベクトル化処理を交互に使っても状態が引き継がれるか"""
+        whole = HighPassFilter(300, config=self.config).process(self.signal, mode='reference')
+
+        hpf = HighPassFilter(300, config=self.config)
+        first = hpf.process(self.signal[:1000], mode='reference')
+        second = hpf.process(self.signal[1000:])
+
+        np.testing.assert_allclose(np.concatenate([first, second]), whole, atol=1e-10)
+
+    def test_unknown_mode(self):
+        """未知の処理方式はエラーになるか"""
+        with pytest.raises(ValueError):
+            LowPassFilter(1000).process(self.signal, mode='fast')
+
+
+class TestFilterChain:
+    """フィルターチェーン（SOSカスケード）のテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.signal = _test_signal()
+
+    def _stages(self):
+        return [
+            HighPassFilter(100, config=self.config),
+            BandPassFilter(1000, q_factor=0.5, config=self.config),
+            LowPassFilter(4000, config=self.config),
+        ]
+
+    def test_matches_sequential_filters(self):
+        """各フィルターを順番に適用した結果と一致するか"""
+        expected = self.signal
+        for stage in self._stages():
+            expected = stage.process(expected)
+
+        chain = FilterChain(*self._stages())
+        np.testing.assert_allclose(chain.process(self.signal), expected, atol=1e-10)
+        assert chain.sos.shape == (3, 6)
+
+    def test_chunked_processing(self):
+        """状態行列がブロック間で保持されるか"""
+        whole = FilterChain(*self._stages()).process(self.signal)
+
+        chain = FilterChain(*self._stages())
+        chunks = [chain.process(chunk) for chunk in np.array_split(self.signal, 5)]
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-10)
+
+    def test_reset(self):
+        """リセット後は初期状態から処理されるか"""
+        chain = FilterChain(*self._stages())
+        first = chain.process(self.signal)
+        chain.reset()
+        np.testing.assert_allclose(chain.process(self.signal), first)
+
+    def test_invalid_stage(self):
+        """バイクアッド以外や空のチェーンはエラーになるか"""
+        with pytest.raises(ValueError):
+            FilterChain()
+        with pytest.raises(TypeError):
+            FilterChain(LowPassFilter(1000), object())
+
+
+class TestMultichannelFilters:
+    """マルチチャンネル (サンプル数, チャンネル数) 入力のテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.config = AudioConfig()
+        self.stereo = np.column_stack([_test_signal(seed=1), _test_signal(seed=2)])
+
+    def test_biquad_channels_match_mono(self):
+        """各チャンネルの結果がモノラル処理と一致するか"""
+        stereo_out = LowPassFilter(1500, config=self.config).process(self.stereo)
+
+        assert stereo_out.shape == self.stereo.shape
+        for ch in range(2):
+            mono_out = LowPassFilter(1500, config=self.config).process(self.stereo[:, ch])
+            np.testing.assert_allclose(stereo_out[:, ch], mono_out, atol=1e-10)
+
+    def test_biquad_chunked_and_reference(self):
+        """チャンネルごとの状態がブロック間・処理方式間で引き継がれるか"""
+        whole = BandPassFilter(800, config=self.config).process(self.stereo, mode='reference')
+
+        bpf = BandPassFilter(800, config=self.config)
+        first = bpf.process(self.stereo[:1000])
+        second = bpf.process(self.stereo[1000:], mode='reference')
+
+        np.testing.assert_allclose(np.concatenate([first, second]), whole, atol=1e-10)
+
+    @pytest.mark.parametrize("mode", ['vectorized', 'reference'])
+    def test_reused_input_buffer(self, mode):
+        """同じ入力バッファを使い回してストリーミングしても状態が壊れないか"""
+        whole = LowPassFilter(1500, config=self.config).process(self.stereo, mode=mode)
+
+        lpf = LowPassFilter(1500, config=self.config)
+        buffer = np.empty((1024, 2))
+        chunks = []
+        for start in range(0, len(self.stereo), 1024):
+            buffer[:] = self.stereo[start:start + 1024]
+            chunks.append(lpf.process(buffer, mode=mode).copy())
+
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-10)
+
+    def test_filter_chain_surround(self):
+        """フィルターチェーンが多チャンネルを一括処理できるか"""
+        surround = np.column_stack([_test_signal(seed=s) for s in range(6)])
+        chain = FilterChain(HighPassFilter(100), LowPassFilter(3000))
+
+        chunks = [chain.process(chunk) for chunk in np.array_split(surround, 3)]
+        output = np.concatenate(chunks)
+
+        mono = FilterChain(HighPassFilter(100), LowPassFilter(3000)).process(surround[:, 4])
+        np.testing.assert_allclose(output[:, 4], mono, atol=1e-10)
+
+    def test_moving_average_channels(self):
+        """移動平均フィルターがチャンネルごとに平均するか"""
+        output = SimpleMovingAverageFilter(window_size=4).process(self.stereo[:200])
+        mono = SimpleMovingAverageFilter(window_size=4).process(self.stereo[:200, 1])
+
+        np.testing.assert_allclose(output[:, 1], mono)
+
+
+class TestSimpleMovingAverageFilter:
+    """移動平均フィルターのテスト"""
+
+    def setup_method(self):
+        """各テストメソッドの前に実行される準備"""
+        self.signal = _test_signal(2000)
+
+    @pytest.mark.parametrize("window_size", [1, 3, 64, 4096])
+    def test_vectorized_matches_reference(self, window_size):
+        """累積和による処理が参照実装と一致するか"""
+        vectorized = SimpleMovingAverageFilter(window_size).process(self.signal)
+        reference = SimpleMovingAverageFilter(window_size).process(self.signal, mode='reference')
+
+        np.testing.assert_allclose(vectorized, reference, atol=1e-10)
+
+    def test_chunked_streaming(self):
+        """リングバッファがブロック間で保持されるか"""
+        whole = SimpleMovingAverageFilter(50).process(self.signal, mode='reference')
+
+        sma = SimpleMovingAverageFilter(50)
+        first = sma.process(self.signal[:30], mode='reference')  # リングバッファ途中で切り替え
+        second = sma.process(self.signal[30:700])
+        third = sma.process(self.signal[700:], mode='reference')
+
+        np.testing.assert_allclose(np.concatenate([first, second, third]), whole, atol=1e-10)
@@ -0,0 +1,89 @@
+"""
+FM合成のテスト
+
+オペレーター、アルゴリズムの接続、FMシンセサイザーの動作をテストする
+"""
+
+import numpy as np
+import pytest
+from audio_lib.synthesis.fm_synthesis import FMOperator, FMAlgorithm
+from audio_lib.synthesis.oscillators import SineWave
+from audio_lib.instruments.fm_instruments import FMSynthesizer
+from audio_lib.sequencer import Track
+
+
+class TestFMOperator:
+    """FMオペレーターのテスト"""
+    
+    def test_unmodulated_operator_is_sine(self):
+        """変調なしのオペレーターが正弦波になるか"""
+        operator = FMOperator(ratio=2.0, level=0.5)
+        expected = 0.5 * SineWave().generate(880.0, 0.05)
+        np.testing.assert_allclose(operator.render(440.0, 0.05), expected, atol=1e-12)
+    
+    def test_two_operator_fm(self):
+        """2オペレーターのFMが sin(ωc t + β sin(ωm t)) と一致するか"""
+        carrier = FMOperator(ratio=1.0)
+        modulator = FMOperator(ratio=2.0, level=1.5)
+        algorithm = FMAlgorithm([carrier, modulator], connections=[(1, 0)])
+        
+        signal = algorithm.render(220.0, 0.1)
+        
+        t = SineWave()._create_time_array(0.1)
+        expected = np.sin(2 * np.pi * 220.0 * t + 1.5 * np.sin(2 * np.pi * 440.0 * t))
+        np.testing.assert_allclose(signal, expected, atol=1e-9)
+
+
+class TestFMAlgorithm:
+    """オペレーターの接続のテスト"""
+    
+    def test_carriers_detected(self):
+        """他を変調しないオペレーターがキャリアになるか"""
+        operators = [FMOperator() for _ in range(4)]
+        algorithm = FMAlgorithm(operators, connections=[(1, 0), (2, 1), (3, 0)])
+        
+        assert algorithm.carriers == [0]
+        order = algorithm.render_order
+        assert order.index(2) < order.index(1) < order.index(0)
+        assert order.index(3) < order.index(0)
+    
+    def test_loop_rejected(self):
+        """ループする接続がエラーになるか"""
+        operators = [FMOperator() for _ in range(2)]
+        with pytest.raises(ValueError):
+            FMAlgorithm(operators, connections=[(0, 1), (1, 0)])
+    
+    def test_unknown_operator_rejected(self):
+        """存在しないオペレーターへの接続がエラーになるか"""
+        with pytest.raises(ValueError):
+            FMAlgorithm([FMOperator()], connections=[(1, 0)])
+    
+    @pytest.mark.parametrize("carriers", [[2], [-1], [0, 2]])
+    def test_unknown_carrier_rejected(self, carriers):
+        """存在しないオペレーターをキャリアに指定するとエラーになるか"""
+        operators = [FMOperator() for _ in range(2)]
+        with pytest.raises(ValueError):
+            FMAlgorithm(operators, connections=[(1, 0)], carriers=carriers)
+
+
+class TestFMSynthesizer:
+    """FMシンセサイザーのテスト"""
+    
+    @pytest.mark.parametrize("preset", ['electric_piano', 'bell'])
+    def test_presets(self, preset):
+        """プリセットが有限で振幅1以下の音を生成するか"""
+        synth = getattr(FMSynthesizer, preset)()
+        signal = synth.play_note(60, velocity=127, duration=0.5)
+        
+        assert len(signal) == synth.config.duration_to_samples(0.5)
+        assert np.all(np.isfinite(signal))
+        assert 0.0 < np.max(np.abs(signal)) <= 1.0
+    
+    def test_track_render(self):
+        """Track.render() で使えるか"""
+        track = Track("EP", FMSynthesizer.electric_piano())
+        track.add_note(60, start_time=0.0, duration=0.3)
+        track.add_note(64, start_time=0.2, duration=0.3)
+        
+        audio = track.render()
+        assert np.max(np.abs(audio)) > 0.0
@@ -7,7 +7,10 @@
 
 import numpy as np
 import pytest
-from audio_lib.synthesis.oscillators import SineWave, SquareWave, SawtoothWave, TriangleWave
+from audio_lib.synthesis.oscillators import (
+    SineWave, SquareWave, SawtoothWave, TriangleWave, WavetableOscillator,
+    AdditiveOscillator, NoiseGenerator, UnisonOscillator
+)
 
 
 class TestSineWave:
@@ -104,6 +107,19 @@ class TestSquareWave:
         
         # 許容誤差範囲内かチェック
         assert abs(actual_duty_cycle - duty_cycle) < 0.1
+    
+    def test_constructor_duty_cycle_is_default(self):
+        """コンストラクタのデューティ比がgenerate()と他の生成方法で共通か"""
+        oscillator = SquareWave(duty_cycle=0.25)
+        num_samples = 4410
+        
+        signal = oscillator.generate(100.0, 0.1)
+        block = oscillator.generate_block(num_samples, 100.0)
+        batch = oscillator.generate_batch([100.0], 0.1)[0]
+        
+        np.testing.assert_allclose(signal, block, atol=1e-12)
+        np.testing.assert_allclose(signal, batch, atol=1e-12)
+        assert np.sum(signal > 0) / num_samples == pytest.approx(0.25, abs=0.01)
 
 
 class TestWaveformComparison:
@@ -154,6 +170,419 @@ class TestWaveformComparison:
         assert square_harmonics > sine_harmonics
 
 
+class TestStreamingOscillators:
+    """位相を保持する generate_block() のテスト"""
+    
+    @pytest.mark.parametrize("oscillator_class", [SineWave, SawtoothWave, SquareWave, TriangleWave])
+    def test_blocks_match_single_block(self, oscillator_class):
+        """ブロックを連結した波形が一度に生成した波形と一致するか"""
+        # 不連続点がちょうどサンプル位置に来ない周波数（丸め誤差で段差の側が変わらないように）
+        frequency = 437.3
+        whole = oscillator_class().generate_block(10000, frequency)
+        
+        oscillator = oscillator_class()
+        blocks = [oscillator.generate_block(size, frequency) for size in [1, 99, 512, 0, 4096, 5292]]
+        
+        np.testing.assert_allclose(np.concatenate(blocks), whole, atol=1e-9)
+    
+    @pytest.mark.parametrize("oscillator_class", [SineWave, SawtoothWave, TriangleWave])
+    def test_matches_generate(self, oscillator_class):
+        """generate() と同じ波形になるか"""
+        oscillator = oscillator_class()
+        expected = oscillator.generate(220.0, 0.1, phase=0.25)
+        
+        oscillator.reset_phase(0.25)
+        block = oscillator.generate_block(len(expected), 220.0)
+        
+        np.testing.assert_allclose(block, expected, atol=1e-9)
+    
+    def test_phase_stays_bounded(self):
+        """長時間生成しても位相アキュムレーターが0-1に収まるか"""
+        oscillator = SineWave()
+        for _ in range(100):
+            block = oscillator.generate_block(44100, 1234.5)
+            assert 0.0 <= oscillator.phase < 1.0
+        
+        # 100秒後の位相は解析的な値と一致
+        expected_phase = (1234.5 * 100) % 1.0
+        assert abs(oscillator.phase - expected_phase) < 1e-9
+        assert np.max(np.abs(block)) <= 1.0
+    
+    def test_frequency_required(self):
+        """周波数未設定ではエラーになるか"""
+        with pytest.raises(ValueError):
+            SineWave().generate_block(100)
+
+
+def _alias_ratio(signal, frequency, sample_rate=44100):
+    """倍音以外の周波数に含まれるエネルギーの割合（1秒の信号を想定）"""
+    spectrum = np.abs(np.fft.rfft(signal * np.hanning(len(signal)))) ** 2
+    mask = np.ones(len(spectrum), dtype=bool)
+    for harmonic in range(frequency, sample_rate // 2, frequency):
+        mask[harmonic - 20:harmonic + 21] = False
+    return np.sum(spectrum[mask]) / np.sum(spectrum)
+
+
+class TestWavetableOscillator:
+    """ミップマップ・ウェーブテーブルオシレーターのテスト"""
+    
+    @pytest.mark.parametrize("waveform, naive_class", [
+        ('sawtooth', SawtoothWave), ('square', SquareWave), ('triangle', TriangleWave)
+    ])
+    def test_alias_free(self, waveform, naive_class):
+        """素朴な波形よりエイリアシングが大幅に少ないか"""
+        frequency = 3001
+        wavetable = WavetableOscillator(waveform).generate(frequency, 1.0)
+        naive = naive_class().generate(frequency, 1.0)
+        
+        assert _alias_ratio(wavetable, frequency) < _alias_ratio(naive, frequency) / 100
+    
+    def test_low_notes_match_naive_shape(self):
+        """低い音では素朴な波形とほぼ同じ形になるか"""
+        wavetable = WavetableOscillator('triangle').generate(110.0, 0.1)
+        naive = TriangleWave().generate(110.0, 0.1)
+        
+        assert np.max(np.abs(wavetable - naive)) < 0.01
+    
+    def test_tables_are_shared(self):
+        """同じ波形・サンプリング周波数のテーブルが共有されるか"""
+        first = WavetableOscillator('square')
+        second = WavetableOscillator('square')
+        
+        assert first.tables is second.tables
+        assert not first.tables.flags.writeable
+    
+    def test_generate_block(self):
+        """generate_block() で連続した波形を生成できるか"""
+        oscillator = WavetableOscillator('sawtooth')
+        blocks = np.concatenate([oscillator.generate_block(1000, 440.0) for _ in range(4)])
+        whole = WavetableOscillator('sawtooth').generate(440.0, 4000 / 44100)
+        
+        np.testing.assert_allclose(blocks, whole, atol=1e-9)
+    
+    def test_phase_rounding_to_one(self):
+        """丸めで位相が1.0になってもテーブルの範囲外を読まないか"""
+        oscillator = WavetableOscillator('sawtooth')
+        reference = oscillator.generate(440, 0.01)
+        num_samples = len(reference)
+        
+        shifted = oscillator.generate(440, 0.01, phase=-1e-18)
+        modulated = oscillator.generate(440, 0.01, phase_mod=np.full(num_samples, -1e-18))
+        
+        np.testing.assert_allclose(shifted, reference, atol=1e-12)
+        np.testing.assert_allclose(modulated, reference, atol=1e-12)
+    
+    def test_unknown_waveform(self):
+        """未知の波形はエラーになるか"""
+        with pytest.raises(ValueError):
+            WavetableOscillator('noise')
+
+
+class TestPolyBLEP:
+    """PolyBLEP/PolyBLAMPアンチエイリアシングのテスト"""
+    
+    @pytest.mark.parametrize("oscillator_class", [SawtoothWave, SquareWave, TriangleWave])
+    def test_reduces_aliasing(self, oscillator_class):
+        """素朴な波形よりエイリアシングが少ないか"""
+        frequency = 3001
+        naive = oscillator_class().generate(frequency, 1.0)
+        polyblep = oscillator_class(antialias='polyblep').generate(frequency, 1.0)
+        
+        assert _alias_ratio(polyblep, frequency) < _alias_ratio(naive, frequency) / 10
+    
+    def test_high_sawtooth_keeps_harmonics(self):
+        """高い音でも正弦波に切り替わらず倍音を含むか"""
+        frequency = 7001  # sample_rate / 8 より高い
+        signal = SawtoothWave(antialias='polyblep').generate(frequency, 1.0)
+        spectrum = np.abs(np.fft.rfft(signal))
+        
+        assert spectrum[2 * frequency] > 0.2 * spectrum[frequency]
+    
+    def test_pulse_width_modulation(self):
+        """サンプルごとのデューティ比配列でPWMできるか"""
+        oscillator = SquareWave(antialias='polyblep')
+        num_samples = 44100
+        duty = np.linspace(0.1, 0.9, num_samples)
+        signal = oscillator.generate(100.0, 1.0, duty_cycle=duty)
+        
+        assert len(signal) == num_samples
+        # 前半と後半で正の区間の割合が変わる
+        first_half = np.mean(signal[:num_samples // 4] > 0)
+        last_half = np.mean(signal[-num_samples // 4:] > 0)
+        assert first_half < 0.4 < 0.6 < last_half
+    
+    def test_generate_block_uses_polyblep(self):
+        """generate_block() でもアンチエイリアシングが効くか"""
+        oscillator = SawtoothWave(antialias='polyblep')
+        block = oscillator.generate_block(44100, 3001)
+        
+        np.testing.assert_allclose(block, SawtoothWave(antialias='polyblep').generate(3001, 1.0), atol=1e-9)
+    
+    def test_unknown_mode(self):
+        """未知の方式はエラーになるか"""
+        with pytest.raises(ValueError):
+            SquareWave(antialias='blit')
+
+
+class TestBatchGeneration:
+    """generate_batch() のテスト"""
+    
+    @pytest.mark.parametrize("oscillator", [
+        SineWave(), SawtoothWave(), SquareWave(), TriangleWave(),
+        SawtoothWave(antialias='polyblep'), WavetableOscillator('square'),
+    ])
+    def test_rows_match_generate(self, oscillator):
+        """各行が generate() の結果と一致するか"""
+        # sample_rate / 8 をまたぐ周波数を含める
+        frequencies = [110.0, 437.3, 1234.5, 6000.0]
+        phases = [0.0, 0.25, 0.5, 0.9]
+        batch = oscillator.generate_batch(frequencies, 0.05, phases=phases)
+        
+        assert batch.shape == (4, oscillator.config.duration_to_samples(0.05))
+        for row, frequency, phase in zip(batch, frequencies, phases):
+            expected = oscillator.generate(frequency, 0.05, phase=phase)
+            assert np.mean(np.abs(row - expected) < 1e-9) > 0.99
+    
+    def test_amplitudes_sum_rows(self):
+        """振幅を指定すると重み付き合計が返るか"""
+        oscillator = SineWave()
+        frequencies = [220.0, 440.0, 660.0]
+        amplitudes = [1.0, 0.5, 0.25]
+        
+        summed = oscillator.generate_batch(frequencies, 0.1, amplitudes=amplitudes)
+        expected = sum(a * oscillator.generate(f, 0.1) for f, a in zip(frequencies, amplitudes))
+        
+        np.testing.assert_allclose(summed, expected, atol=1e-9)
+
+
+class TestAdditiveOscillator:
+    """加算合成オシレーターのテスト"""
+    
+    def test_matches_sum_of_sines(self):
+        """減衰付き正弦波の直接の和と一致するか"""
+        ratios = [1.0, 2.0, 3.5, 5.1]
+        amplitudes = [1.0, 0.5, 0.3, 0.2]
+        decays = [0.0, 2.0, 5.0, 10.0]
+        oscillator = AdditiveOscillator(ratios, amplitudes, decays, block_size=64)
+        
+        # ブロック長で割り切れない長さにする
+        signal = oscillator.generate(220.0, 0.1, phase=0.3)
+        
+        t = oscillator._create_time_array(0.1)
+        expected = sum(
+            a * np.exp(-d * t) * np.sin(2 * np.pi * (r * 220.0 * t + 0.3))
+            for r, a, d in zip(ratios, amplitudes, decays)
+        )
+        assert len(signal) == len(expected)
+        np.testing.assert_allclose(signal, expected, atol=1e-9)
+    
+    def test_partials_above_nyquist_dropped(self):
+        """ナイキスト周波数以上の部分音が除外されるか"""
+        oscillator = AdditiveOscillator([1.0, 100.0], [1.0, 1.0])
+        signal = oscillator.generate(300.0, 0.05)
+        
+        expected = SineWave().generate(300.0, 0.05)
+        np.testing.assert_allclose(signal, expected, atol=1e-9)
+    
+    def test_default_amplitudes(self):
+        """振幅を省略すると 1/部分音番号 になるか"""
+        oscillator = AdditiveOscillator(np.arange(1, 9))
+        np.testing.assert_allclose(oscillator.amplitudes, 1.0 / np.arange(1, 9))
+
+
+def _band_power_ratio_db(signal, sample_rate, low_band, high_band):
+    """2つの帯域の平均パワーの比 (dB)"""
+    power = np.abs(np.fft.rfft(signal)) ** 2
+    freqs = np.fft.rfftfreq(len(signal), 1.0 / sample_rate)
+    band_power = lambda band: power[(freqs >= band[0]) & (freqs < band[1])].mean()
+    return 10 * np.log10(band_power(low_band) / band_power(high_band))
+
+
+class TestNoiseGenerator:
+    """ノイズジェネレーターのテスト"""
+    
+    def test_seed_is_reproducible(self):
+        """同じシードなら同じ出力になるか"""
+        for method in ['generate_white_noise', 'generate_pink_noise',
+                       'generate_brown_noise', 'generate_velvet_noise']:
+            a = getattr(NoiseGenerator(seed=42), method)(0.1)
+            b = getattr(NoiseGenerator(seed=42), method)(0.1)
+            c = getattr(NoiseGenerator(seed=43), method)(0.1)
+            np.testing.assert_array_equal(a, b)
+            assert not np.array_equal(a, c)
+    
+    def test_spawn_gives_independent_streams(self):
+        """spawn() の子ジェネレーターが再現可能かつ互いに異なるか"""
+        children = NoiseGenerator(seed=7).spawn(3)
+        again = NoiseGenerator(seed=7).spawn(3)
+        
+        outputs = [child.generate_white_noise(0.05) for child in children]
+        for output, child in zip(outputs, again):
+            np.testing.assert_array_equal(output, child.generate_white_noise(0.05))
+        assert not np.array_equal(outputs[0], outputs[1])
+        assert abs(np.corrcoef(outputs[0], outputs[1])[0, 1]) < 0.1
+    
+    def test_amplitude_range(self):
+        """振幅の範囲に収まるか"""
+        generator = NoiseGenerator(seed=0)
+        assert np.max(np.abs(generator.generate_white_noise(0.5, amplitude=0.3))) <= 0.3
+        # 有色ノイズは標準偏差がamplitudeの1/4になる
+        assert np.std(generator.generate_pink_noise(5.0, amplitude=0.3)) == pytest.approx(0.075, rel=0.1)
+        assert np.std(generator.generate_brown_noise(5.0, amplitude=0.3)) == pytest.approx(0.075, rel=0.2)
+    
+    @pytest.mark.parametrize("leak", [-0.1, 1.0, 1.5, float('nan')])
+    def test_invalid_leak(self, leak):
+        """範囲外のleakはエラーになるか"""
+        with pytest.raises(ValueError):
+            NoiseGenerator(seed=0).generate_brown_noise(0.1, leak=leak)
+    
+    @pytest.mark.parametrize("method", ['generate_pink_noise', 'generate_brown_noise'])
+    def test_chunked_matches_single_call(self, method):
+        """分割して生成しても一度に生成した場合と同じ信号になるか"""
+        whole = getattr(NoiseGenerator(seed=5), method)(0.5)
+        
+        generator = NoiseGenerator(seed=5)
+        chunks = [getattr(generator, method)(duration) for duration in (0.1, 0.0, 0.25, 0.15)]
+        
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-12)
+    
+    def test_spectral_slopes(self):
+        """ピンクは約-3dB/oct、ブラウンは約-6dB/oct で減衰するか"""
+        generator = NoiseGenerator(seed=1)
+        sample_rate = generator.config.sample_rate
+        
+        # 200-400Hz と 1600-3200Hz の3オクターブ差
+        pink = _band_power_ratio_db(generator.generate_pink_noise(5.0), sample_rate, (200, 400), (1600, 3200))
+        brown = _band_power_ratio_db(generator.generate_brown_noise(5.0), sample_rate, (200, 400), (1600, 3200))
+        
+        assert 7.0 < pink < 11.0
+        assert 15.0 < brown < 21.0
+    
+    def test_velvet_noise_structure(self):
+        """ベルベットノイズが区間ごとに±1のインパルスを1つ持つか"""
+        generator = NoiseGenerator(seed=3)
+        signal = generator.generate_velvet_noise(1.0, density=2205.0)
+        
+        impulses = np.nonzero(signal)[0]
+        assert len(impulses) == 2205
+        assert set(np.unique(signal[impulses])) <= {-1.0, 1.0}
+        np.testing.assert_array_equal(impulses // 20, np.arange(2205))
+
+
+class TestFrequencyModulation:
+    """サンプルごとの周波数・位相変調入力のテスト"""
+    
+    @pytest.mark.parametrize("oscillator", [
+        SineWave(), SawtoothWave(), SquareWave(), TriangleWave(),
+        TriangleWave(antialias='polyblep'), WavetableOscillator('sawtooth'),
+    ])
+    def test_constant_frequency_array_matches_scalar(self, oscillator):
+        """一定値の周波数配列がスカラー指定と一致するか"""
+        num_samples = oscillator.config.duration_to_samples(0.1)
+        scalar = oscillator.generate(437.3, 0.1, phase=0.2)
+        array = oscillator.generate(np.full(num_samples, 437.3), 0.1, phase=0.2)
+        
+        # 位相の折り返し直前・直後の丸め差を除いて一致する
+        assert np.mean(np.abs(scalar - array) < 1e-9) > 0.99
+    
+    def test_pitch_sweep(self):
+        """周波数スイープでゼロ交差の間隔が狭くなるか"""
+        oscillator = SineWave()
+        num_samples = oscillator.config.duration_to_samples(1.0)
+        frequency = np.linspace(100.0, 1000.0, num_samples)
+        signal = oscillator.generate(frequency, 1.0)
+        
+        # 瞬時周波数の積分 = 位相（周期数）: 平均550Hz × 1秒
+        crossings = np.nonzero(np.diff(np.signbit(signal)))[0]
+        assert abs(len(crossings) / 2 - 550) < 2
+        assert np.all(np.abs(signal) <= 1.0)
+    
+    def test_phase_mod_offsets_phase(self):
+        """一定の位相変調が初期位相の指定と同じになるか"""
+        oscillator = SineWave()
+        shifted = oscillator.generate(440.0, 0.05, phase=0.25)
+        modulated = oscillator.generate(440.0, 0.05, phase_mod=0.25)
+        np.testing.assert_allclose(modulated, shifted, atol=1e-9)
+    
+    def test_generate_block_with_frequency_array(self):
+        """generate_block() が周波数配列を受け取り、位相と周波数を引き継ぐか"""
+        oscillator = SineWave()
+        frequency = np.linspace(200.0, 400.0, 2048)
+        whole = oscillator.generate(frequency, 2048 / oscillator.config.sample_rate)
+        
+        oscillator.reset_phase()
+        first = oscillator.generate_block(1024, frequency[:1024])
+        second = oscillator.generate_block(1024, frequency[1024:])
+        
+        np.testing.assert_allclose(np.concatenate([first, second]), whole, atol=1e-9)
+        assert oscillator.frequency == 400.0
+    
+    def test_frequency_array_length_mismatch(self):
+        """周波数配列の長さが合わない場合にエラーになるか"""
+        with pytest.raises(ValueError):
+            SineWave().generate(np.full(10, 440.0), 0.1)
+
+
+class TestUnisonOscillator:
+    """ユニゾンオシレーターのテスト"""
+    
+    def test_single_voice_matches_oscillator(self):
+        """1ボイスなら元のオシレーターと同じ波形が左右に出るか"""
+        unison = UnisonOscillator(SawtoothWave(), voices=1, seed=0)
+        signal = unison.generate(220.0, 0.05)
+        
+        phase = np.random.default_rng(0).random(1)[0]
+        expected = SawtoothWave().generate(220.0, 0.05, phase=phase)
+        
+        assert signal.shape == (len(expected), 2)
+        assert np.mean(np.abs(signal[:, 0] - expected) < 1e-9) > 0.99
+        np.testing.assert_allclose(signal[:, 0], signal[:, 1])
+    
+    def test_seed_is_reproducible(self):
+        """同じシードなら同じ出力になるか"""
+        a = UnisonOscillator(voices=9, seed=5).generate(110.0, 0.1)
+        b = UnisonOscillator(voices=9, seed=5).generate(110.0, 0.1)
+        np.testing.assert_array_equal(a, b)
+    
+    def test_stereo_spread(self):
+        """広がり0ではモノラル、1では左右が異なるか"""
+        mono = UnisonOscillator(voices=7, stereo_spread=0.0, seed=1).generate(110.0, 0.1)
+        wide = UnisonOscillator(voices=7, stereo_spread=1.0, seed=1).generate(110.0, 0.1)
+        
+        np.testing.assert_allclose(mono[:, 0], mono[:, 1])
+        assert np.corrcoef(wide[:, 0], wide[:, 1])[0, 1] < 0.9
+    
+    def test_voice_detune_range(self):
+        """ボイスが ±detune_cents の範囲に並ぶか"""
+        unison = UnisonOscillator(voices=5, detune_cents=30.0)
+        cents = unison._voice_positions() * unison.detune_cents
+        np.testing.assert_allclose(cents, [-30.0, -15.0, 0.0, 15.0, 30.0])
+    
+    def test_invalid_voices(self):
+        """ボイス数が0の場合にエラーになるか"""
+        with pytest.raises(ValueError):
+            UnisonOscillator(voices=0)
+    
+    def test_wrapped_additive(self):
+        """加算合成オシレーターのボイスが個別に生成した波形と一致するか"""
+        additive = AdditiveOscillator([1.0, 2.0, 3.0], decays=[0.0, 5.0, 10.0])
+        unison = UnisonOscillator(additive, voices=3, detune_cents=10.0, stereo_spread=0.0, seed=2)
+        output = unison.generate(220.0, 0.1)
+        
+        frequencies = 220.0 * 2.0 ** (np.array([-10.0, 0.0, 10.0]) / 1200.0)
+        phases = np.random.default_rng(2).random(3)
+        voices = [additive.generate(f, 0.1, p) for f, p in zip(frequencies, phases)]
+        expected = np.sum(voices, axis=0) * np.cos(np.pi / 4) * np.sqrt(2.0 / 3)
+        
+        assert output.shape == (len(expected), 2)
+        np.testing.assert_allclose(output[:, 0], expected, atol=1e-10)
+    
+    def test_unpitched_oscillator_rejected(self):
+        """ボイスを作れないオシレーターは作成時にエラーになるか"""
+        with pytest.raises(TypeError):
+            UnisonOscillator(NoiseGenerator())
+
+
 if __name__ == "__main__":
     # 単体でテストを実行する場合
     pytest.main([__file__, "-v"])